@@ -4,6 +4,8 @@ from collections import defaultdict
 from typing import Dict, List, Set, Tuple
 import re
 
+SUCCESS_CODE_RE = re.compile(r'OUT_HTTP_2\d{2}')
+
 # -------------------------Function to group claims by comparison key----------------------------------------
 def group_claims(claims: list[Claim]) -> dict[str, list[Claim]]:
     groups = defaultdict(list)
@@ -20,7 +22,7 @@ def detect_multiple_success_variants(bucket: List[Claim]) -> List[Finding]:
     success_codes = set()
     for claim in bucket:
         assertion = claim.assertion
-        if re.match(r'OUT_HTTP_2\d{2}', assertion):
+        if SUCCESS_CODE_RE.match(assertion):
             success_codes.add(assertion)
     
     if len(success_codes) > 1:
@@ -0,0 +1,81 @@
+from app.claims.claim_model import Claim
+from app.analysis.analysis import analyse_claims
+from app.analysis.analysis_model import AnalysisObject, EvaluationObject, Finding
+from app.analysis.evaluation import evaluate_bucket
+from collections import OrderedDict
+from typing import Callable, List
+import threading
+
+# -------------------------In-process memo for analysis & evaluation-------------------------
+# Keyed on claim field values, so an identical claim set (re-analysing an
+# unchanged codebase, repeated fixtures) is analysed and evaluated once.
+# The models are mutable, so the cache keeps its own instances and every
+# caller gets a deep copy; mutating a result never changes a later hit.
+# The API server runs handlers in a threadpool, so the LRU is lock-guarded.
+
+MAX_CACHED_RESULTS = 256
+
+_results: "OrderedDict[tuple, object]" = OrderedDict()
+_results_lock = threading.Lock()
+
+def claims_key(claims: List[Claim]) -> tuple:
+    """
+    Value key for a claim list. Claim hashes, but its __eq__ ignores
+    confidence, so claims themselves as keys would let buckets differing only
+    in confidence share a result; every field is keyed instead.
+    """
+    return tuple(
+        (c.endpoint, c.category.value, c.condition, c.assertion, c.source.value, c.confidence)
+        for c in claims
+    )
+
+def _freeze(value) -> object:
+    """Hashable, order-preserving form of a finding's details."""
+    if isinstance(value, dict):
+        return tuple((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+def findings_key(findings: List[Finding]) -> tuple:
+    """Value key for findings, covering every field the evaluation carries."""
+    return tuple(
+        (f.kind.value, f.description, claims_key(f.related_claims), _freeze(f.details))
+        for f in findings
+    )
+
+def _memoized(key: tuple, compute: Callable[[], object]):
+    with _results_lock:
+        if key in _results:
+            _results.move_to_end(key)
+            return _results[key]
+
+    # Computed outside the lock; a concurrent miss on the same key just
+    # computes the same value twice
+    value = compute()
+    with _results_lock:
+        _results[key] = value
+        if len(_results) > MAX_CACHED_RESULTS:
+            _results.popitem(last=False)
+    return value
+
+def analyse_claims_cached(claims: List[Claim]) -> List[AnalysisObject]:
+    """analyse_claims, reusing the result for a previously seen claim set."""
+    analyses = _memoized(("analyse", claims_key(claims)), lambda: tuple(analyse_claims(claims)))
+    return [analysis.model_copy(deep=True) for analysis in analyses]
+
+def evaluate_bucket_cached(bucket: List[Claim], findings: List[Finding]) -> EvaluationObject:
+    """evaluate_bucket, reusing the result for a previously seen bucket and findings."""
+    key = ("evaluate", claims_key(bucket), findings_key(findings))
+    return _memoized(key, lambda: evaluate_bucket(bucket, findings)).model_copy(deep=True)
+
+def clear_cache() -> None:
+    with _results_lock:
+        _results.clear()
+# -------------------------In-process memo for analysis & evaluation-------------------------
@@ -5,6 +5,16 @@ import re
 
 # -------------------------Evaluation Layer (Heuristics & Scoring)-------------------------
 
+# Weight by source reliability: TEST > API_SPEC > README
+SOURCE_WEIGHTS = {
+    ArtifactSource.TEST: 1.0,
+    ArtifactSource.API_SPEC: 0.9,
+    ArtifactSource.README: 0.7
+}
+
+# Finding kinds that raise a bucket to high risk on their own
+HIGH_RISK_KINDS = frozenset({FindingKind.MULTIPLE_SUCCESS_VARIANTS, FindingKind.DOCUMENTATION_ONLY})
+
 def calculate_coverage_score(sources: Set[ArtifactSource]) -> float:
     """Calculate coverage score based on artifact source diversity - heuristic evaluation."""
     total_sources = 3  # README, API_SPEC, TEST
@@ -15,18 +25,11 @@ def calculate_confidence_score(bucket: List[Claim]) -> float:
     if not bucket:
         return 0.0
     
-    # Weight by source reliability: TEST > API_SPEC > README
-    weights = {
-        ArtifactSource.TEST: 1.0,
-        ArtifactSource.API_SPEC: 0.9,
-        ArtifactSource.README: 0.7
-    }
-    
     total_weight = 0
     weighted_confidence = 0
     
     for claim in bucket:
-        weight = weights.get(claim.source, 0.5)
+        weight = SOURCE_WEIGHTS.get(claim.source, 0.5)
         weighted_confidence += claim.confidence * weight
         total_weight += weight
     
@@ -34,15 +37,13 @@ def calculate_confidence_score(bucket: List[Claim]) -> float:
 
 def determine_risk_level(findings: List[Finding], confidence_score: float, coverage_score: float) -> str:
     """Determine overall risk level based on findings and scores - heuristic evaluation."""
-    # Count findings by semantic significance (not using deprecated severity field)
-    contradiction_findings = [f for f in findings if f.kind == FindingKind.CONTRADICTION]
-    multiple_variants_findings = [f for f in findings if f.kind == FindingKind.MULTIPLE_SUCCESS_VARIANTS]
-    documentation_only_findings = [f for f in findings if f.kind == FindingKind.DOCUMENTATION_ONLY]
+    # Classify findings by semantic significance (not using deprecated severity field)
+    kinds = {f.kind for f in findings}
     
     # Heuristic risk assessment
-    if contradiction_findings or confidence_score < 0.3:
+    if FindingKind.CONTRADICTION in kinds or confidence_score < 0.3:
         return "critical"
-    elif multiple_variants_findings or documentation_only_findings or confidence_score < 0.5 or coverage_score < 0.5:
+    elif not HIGH_RISK_KINDS.isdisjoint(kinds) or confidence_score < 0.5 or coverage_score < 0.5:
         return "high"
     elif confidence_score < 0.7 or coverage_score < 0.7:
         return "medium"
@@ -0,0 +1,12 @@
+from app.claims.claim_model import Claim
+from app.analysis.analysis_model import AnalysisObject, EvaluationObject
+from app.analysis.cache import analyse_claims_cached, evaluate_bucket_cached
+from typing import Iterator, List, Tuple
+
+def analyse_and_evaluate(claims: List[Claim]) -> Iterator[Tuple[AnalysisObject, EvaluationObject]]:
+    """
+    Analyse claims and evaluate each resulting bucket in one pass, yielding
+    (analysis, evaluation) pairs in analysis order.
+    """
+    for analysis in analyse_claims_cached(claims):
+        yield analysis, evaluate_bucket_cached(analysis.claims, analysis.findings)
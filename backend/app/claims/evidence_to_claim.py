@@ -1,5 +1,5 @@
 import re
-from typing import List, Optional, Tuple, Dict, Union
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict, Union
 from pydantic import BaseModel, Field
 from app.claims.claim_model import ArtifactSource, Claim, ClaimCategory
 from app.evidence.evidence_model import Evidence, EvidenceType
@@ -202,15 +202,17 @@ class DeterministicClaimGenerator:
         
         return None
 
-    def process(self, evidence_list: List[Evidence]) -> Tuple[List[Claim], List[ClaimRejection]]:
-        emitted_claims = []
-        rejections = []
-
-        for ev in evidence_list:
+    def process_iter(self, evidence: Iterable[Evidence]) -> Iterator[Union[Claim, ClaimRejection]]:
+        """
+        Stream claims and rejections in evidence order. Each evidence item is
+        handled independently, so callers can feed it straight from
+        extraction without holding the whole corpus.
+        """
+        for ev in evidence:
             # Phase 0
             is_admitted, canonical_endpoint, rejection = self._admit(ev)
             if not is_admitted:
-                rejections.append(rejection)
+                yield rejection
                 continue
 
             # Phase 1: Skeleton Branching
@@ -227,20 +229,30 @@ class DeterministicClaimGenerator:
                     # Phase 2: Assertion
                     assertion, rejection = self._canonicalize_assertion(skel)
                     if not assertion:
-                        rejections.append(rejection)
+                        yield rejection
                         continue
 
                     # Phase 3: Condition
                     condition = self._extract_condition(skel.raw_observation)
 
                     # Phase 4: Materialization
-                    emitted_claims.append(Claim(
+                    yield Claim(
                         category=skel.category,
                         endpoint=skel.endpoint,
                         condition=condition,
                         assertion=assertion,
                         source=skel.source,
                         confidence=0.9 if source != ArtifactSource.README else 0.7
-                    ))
+                    )
+
+    def process(self, evidence_list: List[Evidence]) -> Tuple[List[Claim], List[ClaimRejection]]:
+        emitted_claims = []
+        rejections = []
+
+        for item in self.process_iter(evidence_list):
+            if isinstance(item, ClaimRejection):
+                rejections.append(item)
+            else:
+                emitted_claims.append(item)
 
-        return emitted_claims, rejections
\ No newline at end of file
+        return emitted_claims, rejections
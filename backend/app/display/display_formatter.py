@@ -92,7 +92,28 @@ def format_context_block(unit_card: BehaviorUnitCard, show_context: bool = False
     
     return context
 
-def format_canonical_unit_card(unit_card: BehaviorUnitCard, show_context: bool = False) -> str:
+def format_canonical_unit_card(
+    unit_card: BehaviorUnitCard, show_context: bool = False, card_cache: Optional[dict] = None
+) -> str:
+    """
+    Format the canonical unit card. card_cache, owned by the caller for one
+    display pass, reuses output for a card already formatted in that pass.
+    """
+    if card_cache is None:
+        return _format_canonical_unit_card(unit_card, show_context)
+    
+    # Entries keep the card itself, so a hit is only taken for the very
+    # same object and its id cannot be reused while the pass is running
+    key = (id(unit_card), show_context)
+    cached = card_cache.get(key)
+    if cached is not None and cached[0] is unit_card:
+        return cached[1]
+    
+    formatted = _format_canonical_unit_card(unit_card, show_context)
+    card_cache[key] = (unit_card, formatted)
+    return formatted
+
+def _format_canonical_unit_card(unit_card: BehaviorUnitCard, show_context: bool) -> str:
     """Format the canonical unit card exactly as specified."""
     
     lines = []
@@ -227,7 +248,9 @@ def format_display_summary(display_context: DisplayContext) -> str:
 
 # -------------------------Complete Display Formatter-------------------------------------
 
-def format_complete_display(display_context: DisplayContext, show_context: bool = False) -> str:
+def format_complete_display(
+    display_context: DisplayContext, show_context: bool = False, card_cache: Optional[dict] = None
+) -> str:
     """Format complete display with all three tiers."""
     
     sections = []
@@ -241,7 +264,7 @@ def format_complete_display(display_context: DisplayContext, show_context: bool
     sections.append("=" * 20)
     for i, unit in enumerate(display_context.behavioral_units):
         sections.append(f"\n[{i+1}] " + "=" * 40)
-        sections.append(format_canonical_unit_card(unit, show_context))
+        sections.append(format_canonical_unit_card(unit, show_context, card_cache))
     
     sections.append("\n" + "=" * 60)
     
@@ -1,6 +1,9 @@
 from .client import get_client
 from google.genai import types
 import json
+import logging
+
+logger = logging.getLogger(__name__)
 
 #--------------Text Generation Function----------------------
 def generate_structured(
@@ -21,8 +24,7 @@ def generate_structured(
     if not response or not response.text:
         raise RuntimeError("Empty Gemini response")
 
-    # Debug Statement
-    print(f"Gemini response received: {response.text}")
+    logger.debug("Gemini response received: %s", response.text)
 
     response_text = response.text
     # Cleanse the output for a valid JSON
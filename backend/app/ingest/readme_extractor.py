@@ -1,62 +1,117 @@
 from app.evidence.evidence_model import Evidence, EvidenceType
 from app.gemini import generate_structured
+from collections import OrderedDict
 from typing import List, Tuple
+import copy
+import hashlib
+import logging
 import os
 import re
+import threading
 
+logger = logging.getLogger(__name__)
 
-def extract_readme_evidence(file_path: str, content: str) -> List[Evidence]:
-    """
-    Extract evidence from README files using conservative heuristics
-    and LLM-assisted literal claim extraction.
-    """
-    print(f"Extracting README evidence from {file_path}")
+# "METHOD /path" in context lines: a backticked endpoint anywhere on a line
+# takes precedence over a bare one, so the bare form is only tried on a miss
+_CTX_BACKTICK_ENDPOINT_RE = re.compile(r"`([A-Z]+)\s+([/\w{}.-]+)`")
+_CTX_BARE_ENDPOINT_RE = re.compile(r"([A-Z]+)\s+([/\w{}.-]+)")
 
-    evidence_list: List[Evidence] = []
-    lines = content.split('\n')
+# Lines that could be headers: '#'-prefixed or ':'-terminated. Kept as two
+# patterns because each has a literal anchor re can skip ahead to.
+_HASH_HEADER_RE = re.compile(r"\n[^\S\n]*#")
+_FIRST_HASH_HEADER_RE = re.compile(r"[^\S\n]*#")
+_COLON_HEADER_RE = re.compile(r":[^\S\n]*$", re.MULTILINE)
 
-    api_sections = _find_api_sections(lines)
+_README_SYSTEM_INSTRUCTION = (
+    "You extract literal API behavioral claims from documentation. "
+    "Only emit claims that are explicitly stated. "
+    "Never infer missing details. "
+    "Use canonical endpoint formats with path parameters in curly braces."
+)
 
-    for start_line, end_line, section_content in api_sections:
-        prompt = f"""
-Analyze the following README section and extract API behavior claims.
+# ---------- Section detection tables ----------
+# Fixed at import time so _find_api_sections does not rebuild them per call.
 
-Section content:
-{section_content}
+API_KEYWORDS = (
+    "api", "endpoint", "route", "request", "response", "http", "rest",
+    "status", "error", "get", "post", "put", "delete", "patch",
+)
 
-Rules:
-- Only extract literal, testable statements about observable API behavior.
-- Do NOT summarize, infer, combine, or generalize.
-- Each claim must correspond to a contiguous snippet of text.
-- The raw_snippet MUST be copied verbatim from the section content.
-- If the section does not explicitly mention an endpoint, return an empty array.
+API_ROOT_HEADERS = frozenset({
+    "api", "endpoints", "routes", "rest api", "http api",
+})
 
-Focus on:
-- HTTP status codes and error conditions
-- Input validation and preconditions
-- Output formats and guarantees
-- Explicit endpoint behavior descriptions
+SIGNAL_THRESHOLD = 2
 
-Return a JSON array of objects with:
-- endpoint: canonical endpoint (e.g., "GET /users/{{id}}")
-- observation: specific behavior (e.g., "returns HTTP 404 when user not found")
-- raw_snippet: exact verbatim text from the document
+# Fallback extractor statements, compiled once rather than looked up in
+# re's cache for every line of every section
+FALLBACK_PATTERNS = (
+    (re.compile(r"returns?\s+(?:HTTP\s+)?(\d+)", re.IGNORECASE), lambda m: f"returns HTTP {m.group(1)}"),
+    (re.compile(r"responds?\s+with\s+(?:HTTP\s+)?(\d+)", re.IGNORECASE), lambda m: f"returns HTTP {m.group(1)}"),
+    (re.compile(r"status\s+code\s+(\d+)", re.IGNORECASE), lambda m: f"returns HTTP {m.group(1)}"),
+)
 
-Return ONLY the raw JSON array. No markdown (e.g. ```JSON). No commentary.
-"""
 
-        system_instruction = (
-            "You extract literal API behavioral claims from documentation. "
-            "Only emit claims that are explicitly stated. "
-            "Never infer missing details. "
-            "Use canonical endpoint formats with path parameters in curly braces."
-        )
+def _is_api_header(header_text: str) -> bool:
+    """Check if header indicates an API section."""
+    # Exact matches
+    if header_text in API_ROOT_HEADERS:
+        return True
+    # Contains 'api' keyword
+    if "api" in header_text:
+        return True
+    # Contains multiple API keywords
+    return _count_api_keywords(header_text) >= 2
+
+
+def _classify_header(line: str) -> Tuple[int, bool]:
+    stripped = line.lstrip()
+    if stripped.startswith("#"):
+        level = len(stripped) - len(stripped.lstrip("#"))
+        return level, False
+    if line.strip().endswith(":"):
+        return 10_000, True
+    return 0, False
+
+
+def _count_api_keywords(text: str) -> int:
+    count = 0
+    for kw in API_KEYWORDS:
+        if kw in text:
+            count += 1
+    return count
 
+
+def _get_api_signal(line: str) -> int:
+    return _count_api_keywords(line.lower())
+
+
+def _is_killer_header(level: int, root_level: int, line: str) -> bool:
+    # Cheap level check first; keyword counting only for candidate headers
+    if level <= 0 or level > root_level:
+        return False
+    return _get_api_signal(line) < SIGNAL_THRESHOLD
+
+
+def extract_readme_evidence(file_path: str, content: str) -> List[Evidence]:
+    """
+    Extract evidence from README files using conservative heuristics
+    and LLM-assisted literal claim extraction.
+    """
+    logger.debug("Extracting README evidence from %s", file_path)
+
+    evidence_list: List[Evidence] = []
+
+    api_sections = _find_api_sections_cached(content)
+
+    for start_line, end_line, section_content in api_sections:
         try:
-            print(f"Invoking Gemini for README section lines {start_line}-{end_line}")
-            result = generate_structured(prompt, system_instruction)
+            logger.debug(
+                "Invoking Gemini for README section lines %d-%d", start_line, end_line
+            )
+            result = _extract_section_claims(section_content)
         except Exception as e:
-            print(f"Gemini invocation failed: {e}. Using fallback extractor.")
+            logger.warning("Gemini invocation failed: %s. Using fallback extractor.", e)
             evidence_list.extend(
                 _extract_readme_fallback(file_path, section_content, start_line)
             )
@@ -89,97 +144,164 @@ Return ONLY the raw JSON array. No markdown (e.g. ```JSON). No commentary.
     return evidence_list
 
 
-def _find_api_sections(lines: List[str]) -> List[Tuple[int, int, str]]:
+# Gemini results per exact section text, so sections repeated across READMEs
+# (vendored copies, shared boilerplate) cost a single call. Only well-formed
+# responses are stored: a transient error or malformed reply is retried the
+# next time the section is seen instead of sticking for the process lifetime.
+# Entries are private deep copies and callers get fresh ones, so mutating a
+# result never changes the cache; the API server calls this from threads.
+MAX_CACHED_SECTIONS = 512
+
+_section_claims: "dict[str, tuple]" = {}
+_section_claims_lock = threading.Lock()
+
+
+def _is_well_formed(result) -> bool:
+    return isinstance(result, list) and all(isinstance(item, dict) for item in result)
+
+
+def _extract_section_claims(section_content: str):
+    """
+    Ask Gemini for literal claims in one README section, reusing a cached
+    well-formed result. Callers still apply the raw_snippet provenance check.
+    """
+    with _section_claims_lock:
+        cached = _section_claims.get(section_content)
+    if cached is not None:
+        return copy.deepcopy(list(cached))
+
+    prompt = f"""
+Analyze the following README section and extract API behavior claims.
+
+Section content:
+{section_content}
+
+Rules:
+- Only extract literal, testable statements about observable API behavior.
+- Do NOT summarize, infer, combine, or generalize.
+- Each claim must correspond to a contiguous snippet of text.
+- The raw_snippet MUST be copied verbatim from the section content.
+- If the section does not explicitly mention an endpoint, return an empty array.
+
+Focus on:
+- HTTP status codes and error conditions
+- Input validation and preconditions
+- Output formats and guarantees
+- Explicit endpoint behavior descriptions
+
+Return a JSON array of objects with:
+- endpoint: canonical endpoint (e.g., "GET /users/{{id}}")
+- observation: specific behavior (e.g., "returns HTTP 404 when user not found")
+- raw_snippet: exact verbatim text from the document
+
+Return ONLY the raw JSON array. No markdown (e.g. ```JSON). No commentary.
+"""
+
+    result = generate_structured(prompt, _README_SYSTEM_INSTRUCTION)
+    if _is_well_formed(result):
+        stored = tuple(copy.deepcopy(result))
+        with _section_claims_lock:
+            if len(_section_claims) >= MAX_CACHED_SECTIONS:
+                # Evict the oldest entry (dicts keep insertion order)
+                _section_claims.pop(next(iter(_section_claims)), None)
+            _section_claims[section_content] = stored
+    return result
+
+
+# Section scans keyed on a digest of the README body, so identical READMEs
+# (re-runs, forks, vendored copies) are only scanned once without keeping
+# whole bodies alive as keys. Lock-guarded for the API server's threads.
+MAX_CACHED_SCANS = 32
+
+_api_sections: "OrderedDict[bytes, Tuple[Tuple[int, int, str], ...]]" = OrderedDict()
+_api_sections_lock = threading.Lock()
+
+
+def _find_api_sections_cached(content: str) -> Tuple[Tuple[int, int, str], ...]:
+    """Memoized _find_api_sections for a README body."""
+    key = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _api_sections_lock:
+        if key in _api_sections:
+            _api_sections.move_to_end(key)
+            return _api_sections[key]
+
+    sections = tuple(_find_api_sections(content))
+    with _api_sections_lock:
+        _api_sections[key] = sections
+        if len(_api_sections) > MAX_CACHED_SCANS:
+            _api_sections.popitem(last=False)
+    return sections
+
+
+def _find_api_sections(content: str) -> List[Tuple[int, int, str]]:
     """
     Identify README sections likely to contain API behavior descriptions.
     Conservative by design: prefers precision over recall.
+
+    Only header-like lines can open or close a section, so the scan jumps
+    between them using the header regexes and slices section text straight
+    out of the content instead of visiting every body line.
     """
     sections = []
-    section_lines: List[str] = []
     section_start = 1
+    section_offset = 0
     in_api_section = False
     section_root_level = 0
 
-    API_KEYWORDS = {
-        "api", "endpoint", "route", "request", "response", "http", "rest",
-        "status", "error", "get", "post", "put", "delete", "patch"
-    }
-
-    API_ROOT_HEADERS = {
-        "api", "endpoints", "routes", "rest api", "http api"
-    }
-
-    # Also match headers that contain API keywords
-    def is_api_header(header_text: str) -> bool:
-        """Check if header indicates an API section."""
-        # Exact matches
-        if header_text in API_ROOT_HEADERS:
-            return True
-        # Contains 'api' keyword
-        if "api" in header_text:
-            return True
-        # Contains multiple API keywords
-        api_count = sum(1 for kw in API_KEYWORDS if kw in header_text)
-        return api_count >= 2
-
-    SIGNAL_THRESHOLD = 2
-
-    def classify_header(line: str) -> Tuple[int, bool]:
-        stripped = line.lstrip()
-        if stripped.startswith("#"):
-            level = len(stripped) - len(stripped.lstrip("#"))
-            return level, False
-        if line.strip().endswith(":"):
-            return 10_000, True
-        return 0, False
-
-    def get_api_signal(line: str) -> int:
-        line_lower = line.lower()
-        return sum(1 for kw in API_KEYWORDS if kw in line_lower)
-
-    def is_killer_header(level: int, root_level: int, signal: int) -> bool:
-        return level > 0 and level <= root_level and signal < SIGNAL_THRESHOLD
-
-    for i, line in enumerate(lines, 1):
-        level, is_pseudo = classify_header(line)
-        api_signal = get_api_signal(line)
-        header_text = line.lower().strip("# ").strip(":")
+    header_offsets = {m.start() + 1 for m in _HASH_HEADER_RE.finditer(content)}
+    if _FIRST_HASH_HEADER_RE.match(content):
+        header_offsets.add(0)
+    header_offsets.update(
+        content.rfind("\n", 0, m.start()) + 1
+        for m in _COLON_HEADER_RE.finditer(content)
+    )
+
+    i = 1
+    scanned_to = 0
+
+    for line_offset in sorted(header_offsets):
+        i += content.count("\n", scanned_to, line_offset)
+        scanned_to = line_offset
+        line_end = content.find("\n", line_offset)
+        if line_end == -1:
+            line_end = len(content)
+        line = content[line_offset:line_end]
+
+        level, is_pseudo = _classify_header(line)
 
         # Exit logic
         if in_api_section:
-            if is_killer_header(level, section_root_level, api_signal):
+            if _is_killer_header(level, section_root_level, line):
                 sections.append(
-                    (section_start, i - 1, "\n".join(section_lines))
+                    (section_start, i - 1, content[section_offset:line_offset - 1])
                 )
-                section_lines = []
                 in_api_section = False
                 section_root_level = 0
 
         # Start logic
         if not in_api_section:
+            header_text = line.lower().strip("# ").strip(":")
             if (
                 level > 0
                 and (
-                    is_api_header(header_text)
-                    or api_signal >= SIGNAL_THRESHOLD
+                    _is_api_header(header_text)
+                    or _get_api_signal(line) >= SIGNAL_THRESHOLD
                 )
             ):
                 in_api_section = True
                 section_start = i
+                section_offset = line_offset
                 section_root_level = level
                 if is_pseudo:
                     section_root_level = 999
 
-        # Buffering
-        if in_api_section:
-            section_lines.append(line)
-
-    if in_api_section and section_lines:
+    if in_api_section:
+        total_lines = i + content.count("\n", scanned_to)
         sections.append(
-            (section_start, len(lines), "\n".join(section_lines))
+            (section_start, total_lines, content[section_offset:])
         )
 
-    print(f"Identified {len(sections)} API-like README sections")
+    logger.debug("Identified %d API-like README sections", len(sections))
     return sections
 
 
@@ -190,34 +312,33 @@ def _extract_readme_fallback(
     Conservative fallback extractor.
     Only emits evidence for explicitly stated behavior.
     """
-    evidence_list: List[Evidence] = []
+    rows: List[Tuple[str, str, str, str]] = []
     lines = content.split("\n")
 
-    patterns = [
-        (r"returns?\s+(?:HTTP\s+)?(\d+)", lambda m: f"returns HTTP {m.group(1)}"),
-        (r"responds?\s+with\s+(?:HTTP\s+)?(\d+)", lambda m: f"returns HTTP {m.group(1)}"),
-        (r"status\s+code\s+(\d+)", lambda m: f"returns HTTP {m.group(1)}"),
-    ]
-
     for i, line in enumerate(lines):
-        for pattern, formatter in patterns:
-            for match in re.finditer(pattern, line, re.IGNORECASE):
+        for pattern, formatter in FALLBACK_PATTERNS:
+            for match in pattern.finditer(line):
                 endpoint = _extract_endpoint_from_context(lines, i)
                 if not endpoint:
                     continue
 
-                evidence_list.append(
-                    Evidence(
-                        type=EvidenceType.README_STATEMENT,
-                        endpoint=endpoint,
-                        observation=formatter(match),
-                        source_file=os.path.basename(file_path),
-                        source_location=f"line {start_line + i}",
-                        raw_snippet=line.strip(),
-                    )
+                rows.append(
+                    (endpoint, formatter(match), f"line {start_line + i}", line.strip())
                 )
 
-    return evidence_list
+    source_file = os.path.basename(file_path)
+    # Fields are regex captures from the section itself, so validation is skipped
+    return [
+        Evidence.model_construct(
+            type=EvidenceType.README_STATEMENT,
+            endpoint=endpoint,
+            observation=observation,
+            source_file=source_file,
+            source_location=source_location,
+            raw_snippet=raw_snippet,
+        )
+        for endpoint, observation, source_location, raw_snippet in rows
+    ]
 
 
 def _extract_endpoint_from_context(
@@ -232,16 +353,11 @@ def _extract_endpoint_from_context(
         min(len(lines), current_line + 6),
     )
 
-    endpoint_patterns = [
-        r"`([A-Z]+)\s+([/\w{}.-]+)`",
-        r"([A-Z]+)\s+([/\w{}.-]+)",
-    ]
-
     for i in search_range:
-        for pattern in endpoint_patterns:
-            match = re.search(pattern, lines[i])
-            if match and len(match.groups()) == 2:
-                method, path = match.groups()
-                return f"{method.upper()} {path}"
+        line = lines[i]
+        match = _CTX_BACKTICK_ENDPOINT_RE.search(line) or _CTX_BARE_ENDPOINT_RE.search(line)
+        if match:
+            method, path = match.groups()
+            return f"{method.upper()} {path}"
 
     return None
\ No newline at end of file
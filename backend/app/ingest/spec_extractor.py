@@ -1,88 +1,244 @@
 from app.evidence.evidence_model import Evidence, EvidenceType
-from typing import List
+from collections import OrderedDict
+from typing import List, Tuple
+import hashlib
 import os
 import json
+import logging
+import sys
+import threading
 import yaml
 
+logger = logging.getLogger(__name__)
 
-def extract_spec_evidence(file_path: str, content: str) -> List[Evidence]:
+# libyaml-backed loader/dumper when PyYAML was built against it
+try:
+    from yaml import CSafeLoader as _YamlLoader, CSafeDumper as _YamlDumper
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader, SafeDumper as _YamlDumper
+
+# orjson parses and dumps large JSON specs several times faster than the
+# stdlib; its JSONDecodeError subclasses json.JSONDecodeError.
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _dump_json_snippet(obj) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+except ImportError:
+    _json_loads = json.loads
+
+    def _dump_json_snippet(obj) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+# Lowercase method -> interned endpoint prefix. Endpoint strings are
+# interned too: they repeat across every evidence item of an operation and
+# across extractors, and are used as grouping keys downstream.
+HTTP_METHODS = {
+    method: sys.intern(method.upper())
+    for method in ("get", "post", "put", "delete", "patch", "head", "options")
+}
+
+
+def _dump_snippet(obj) -> str:
+    return yaml.dump(obj, Dumper=_YamlDumper, sort_keys=False)
+
+
+# Parsed specs keyed on a digest of the text, so re-analysing an unchanged
+# spec skips parsing without keeping the text itself alive. Each entry holds
+# a whole parsed tree, so only a few are kept; the API server parses from
+# handler threads, so the LRU is lock-guarded.
+MAX_CACHED_SPECS = 8
+
+_parsed_specs: "OrderedDict[bytes, tuple]" = OrderedDict()
+_parsed_specs_lock = threading.Lock()
+
+
+def _parse_spec(content: str):
     """
-    Extract literal, structural evidence from OpenAPI / Swagger specifications.
-    This extractor is deterministic and does not infer runtime behavior.
+    Memoized _parse_spec_text. The returned tree is shared between calls
+    and must not be mutated.
     """
-    evidence_list: List[Evidence] = []
-    seen: set[tuple] = set()
+    key = hashlib.blake2b(content.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _parsed_specs_lock:
+        if key in _parsed_specs:
+            _parsed_specs.move_to_end(key)
+            return _parsed_specs[key]
+
+    parsed = _parse_spec_text(content)
+    with _parsed_specs_lock:
+        _parsed_specs[key] = parsed
+        if len(_parsed_specs) > MAX_CACHED_SPECS:
+            _parsed_specs.popitem(last=False)
+    return parsed
 
-    def emit(evidence: Evidence):
-        key = (
-            evidence.type,
-            evidence.endpoint,
-            evidence.source_location,
-            evidence.observation,
-        )
-        if key in seen:
-            return
-        seen.add(key)
-        evidence_list.append(evidence)
 
-    # --- Parse spec (YAML first, JSON fallback) ---
+def _parse_spec_text(content: str):
+    """
+    Parse spec text (JSON fast path, then YAML first, JSON fallback).
+    Returns (tree, snippet dumper); tree is None when the content is neither.
+    Specs taken by the JSON fast path get JSON snippets, which skip the
+    YAML emitter; any readable, stable serialization serves raw_snippet.
+    """
+    if content.lstrip().startswith("{"):
+        try:
+            return _json_loads(content), _dump_json_snippet
+        except json.JSONDecodeError:
+            pass
+
     try:
         try:
-            spec = yaml.safe_load(content)
+            return yaml.load(content, Loader=_YamlLoader), _dump_snippet
         except yaml.YAMLError:
-            spec = json.loads(content)
+            return json.loads(content), _dump_snippet
     except (yaml.YAMLError, json.JSONDecodeError):
-        return []
+        return None, _dump_snippet
 
-    if not isinstance(spec, dict):
-        return []
 
-    paths = spec.get("paths")
-    if not isinstance(paths, dict):
-        return []
+# _schema_ref result for an absent or unusable $ref
+_NO_REF = object()
+
+
+def _schema_ref(obj, source_file: str, endpoint: str):
+    """
+    The object's $ref, or _NO_REF when it has none. A null $ref is returned
+    as None and reported as "references None"; any other non-string value is
+    logged and skipped, since $ref is copied into raw_snippet unvalidated.
+    """
+    if not isinstance(obj, dict) or "$ref" not in obj:
+        return _NO_REF
+    ref = obj["$ref"]
+    if ref is None or isinstance(ref, str):
+        return ref
+    logger.warning("Skipping non-string $ref %r for %s in %s", ref, endpoint, source_file)
+    return _NO_REF
 
-    HTTP_METHODS = {"get", "post", "put", "delete", "patch", "head", "options"}
-    source_file = os.path.basename(file_path)
 
+def _flatten_operations(paths: dict) -> List[Tuple[str, str, str, dict, List[Tuple[str, str, dict]]]]:
+    """
+    Flatten the paths object into (path, method, endpoint, operation,
+    path_parameters) rows, in document order. Skips non-dict path items,
+    non-HTTP keys and non-dict operations, so the emit loop starts from
+    validated shapes. path_parameters holds (source_location, observation,
+    param) for each usable path-level parameter.
+    """
+    operations = []
     for path, path_obj in paths.items():
         if not isinstance(path_obj, dict):
             continue
 
         # --- Path-level parameters ---
-        path_parameters = path_obj.get("parameters", [])
-        if not isinstance(path_parameters, list):
-            path_parameters = []
+        # Validated and formatted once per path, not once per operation
+        path_parameters = []
+        raw_parameters = path_obj.get("parameters", [])
+        if isinstance(raw_parameters, list):
+            for i, param in enumerate(raw_parameters):
+                if not isinstance(param, dict):
+                    continue
+
+                name = param.get("name")
+                location = param.get("in")
+
+                if name and location:
+                    path_parameters.append((
+                        f"paths.{path}.parameters[{i}]",
+                        f"uses path-level parameter '{name}' in {location}",
+                        param,
+                    ))
 
         for method, operation in path_obj.items():
             if not isinstance(method, str):
                 continue
 
             method_lc = method.lower()
-            if method_lc not in HTTP_METHODS:
+            method_name = HTTP_METHODS.get(method_lc)
+            if method_name is None:
                 continue
 
             if not isinstance(operation, dict):
                 continue
 
-            endpoint = f"{method_lc.upper()} {path}"
-            source_base = f"paths.{path}.{method_lc}"
+            endpoint = sys.intern(f"{method_name} {path}")
+            operations.append((path, method_lc, endpoint, operation, path_parameters))
+
+    return operations
+
+
+def extract_spec_evidence(file_path: str, content: str) -> List[Evidence]:
+    """
+    Extract literal, structural evidence from OpenAPI / Swagger specifications.
+    This extractor is deterministic and does not infer runtime behavior.
+    """
+    rows: List[dict] = []
+    seen: set[tuple] = set()
+
+    def emit(**fields):
+        key = (
+            fields["type"],
+            fields["endpoint"],
+            fields["source_location"],
+            fields["observation"],
+        )
+        if key in seen:
+            return
+        seen.add(key)
+        rows.append(fields)
+
+    # --- Parse spec ---
+    spec, dump_snippet = _parse_spec(content)
+
+    if not isinstance(spec, dict):
+        return []
+
+    paths = spec.get("paths")
+    if not isinstance(paths, dict):
+        return []
+
+    source_file = sys.intern(os.path.basename(file_path))
+
+    # Path-level parameters are dumped once per operation; the spec tree is
+    # alive for the whole call, so object ids are stable cache keys here.
+    snippets: dict[int, str] = {}
+
+    def snippet(obj) -> str:
+        key = id(obj)
+        if key not in snippets:
+            snippets[key] = dump_snippet(obj)
+        return snippets[key]
+
+    for path, method_lc, endpoint, operation, path_parameters in _flatten_operations(paths):
+        source_base = f"paths.{path}.{method_lc}"
 
-            # --- Operation-level $ref ---
-            if "$ref" in operation:
+        # --- Operation-level $ref ---
+        if "$ref" in operation:
+            ref = _schema_ref(operation, source_file, endpoint)
+            if ref is not _NO_REF:
                 emit(
-                    Evidence(
-                        type=EvidenceType.SPEC_SCHEMA_REF,
-                        endpoint=endpoint,
-                        observation=f"operation references {operation['$ref']}",
-                        source_file=source_file,
-                        source_location=f"{source_base}.$ref",
-                        raw_snippet=operation["$ref"],
-                    )
+                    type=EvidenceType.SPEC_SCHEMA_REF,
+                    endpoint=endpoint,
+                    observation=f"operation references {ref}",
+                    source_file=source_file,
+                    source_location=f"{source_base}.$ref",
+                    raw_snippet=ref,
                 )
-                continue  # referenced operation replaces inline definition
+            continue  # referenced operation replaces inline definition
+
+        # --- Path-level parameters (applied to operation) ---
+        for source_location, observation, param in path_parameters:
+            emit(
+                type=EvidenceType.SPEC_PARAMETER,
+                endpoint=endpoint,
+                observation=observation,
+                source_file=source_file,
+                source_location=source_location,
+                raw_snippet_source=param,
+            )
 
-            # --- Path-level parameters (applied to operation) ---
-            for i, param in enumerate(path_parameters):
+        # --- Operation-level parameters ---
+        parameters = operation.get("parameters", [])
+        if isinstance(parameters, list):
+            for i, param in enumerate(parameters):
                 if not isinstance(param, dict):
                     continue
 
@@ -91,173 +247,145 @@ def extract_spec_evidence(file_path: str, content: str) -> List[Evidence]:
 
                 if name and location:
                     emit(
-                        Evidence(
-                            type=EvidenceType.SPEC_PARAMETER,
-                            endpoint=endpoint,
-                            observation=f"uses path-level parameter '{name}' in {location}",
-                            source_file=source_file,
-                            source_location=f"paths.{path}.parameters[{i}]",
-                            raw_snippet=yaml.safe_dump(param, sort_keys=False),
-                        )
+                        type=EvidenceType.SPEC_PARAMETER,
+                        endpoint=endpoint,
+                        observation=f"defines parameter '{name}' in {location}",
+                        source_file=source_file,
+                        source_location=f"{source_base}.parameters[{i}]",
+                        raw_snippet_source=param,
                     )
 
-            # --- Operation-level parameters ---
-            parameters = operation.get("parameters", [])
-            if isinstance(parameters, list):
-                for i, param in enumerate(parameters):
-                    if not isinstance(param, dict):
-                        continue
+                ref = _schema_ref(param.get("schema"), source_file, endpoint)
+                if ref is not _NO_REF:
+                    emit(
+                        type=EvidenceType.SPEC_SCHEMA_REF,
+                        endpoint=endpoint,
+                        observation=(
+                            f"parameter '{name}' schema references {ref}"
+                        ),
+                        source_file=source_file,
+                        source_location=f"{source_base}.parameters[{i}].schema.$ref",
+                        raw_snippet=ref,
+                    )
 
-                    name = param.get("name")
-                    location = param.get("in")
+        # --- Responses (OpenAPI 2 & 3) ---
+        responses = operation.get("responses", {})
+        if isinstance(responses, dict):
+            for status_code, response_obj in responses.items():
+                if not isinstance(response_obj, dict):
+                    continue
 
-                    if name and location:
-                        emit(
-                            Evidence(
-                                type=EvidenceType.SPEC_PARAMETER,
-                                endpoint=endpoint,
-                                observation=f"defines parameter '{name}' in {location}",
-                                source_file=source_file,
-                                source_location=f"{source_base}.parameters[{i}]",
-                                raw_snippet=yaml.safe_dump(param, sort_keys=False),
-                            )
-                        )
+                # Include description in observation to capture condition information
+                description = response_obj.get("description", "")
+                if description:
+                    observation = f"documents possible response {status_code}: {description}"
+                else:
+                    observation = f"documents possible response {status_code}"
+
+                emit(
+                    type=EvidenceType.SPEC_RESPONSE,
+                    endpoint=endpoint,
+                    observation=observation,
+                    source_file=source_file,
+                    source_location=f"{source_base}.responses.{status_code}",
+                    raw_snippet_source=response_obj,
+                )
 
-                    schema = param.get("schema")
-                    if isinstance(schema, dict) and "$ref" in schema:
-                        emit(
-                            Evidence(
+                # OpenAPI 3: content → schema
+                content_obj = response_obj.get("content", {})
+                if isinstance(content_obj, dict):
+                    for mime, media in content_obj.items():
+                        if not isinstance(media, dict):
+                            continue
+                        ref = _schema_ref(media.get("schema"), source_file, endpoint)
+                        if ref is not _NO_REF:
+                            emit(
                                 type=EvidenceType.SPEC_SCHEMA_REF,
                                 endpoint=endpoint,
                                 observation=(
-                                    f"parameter '{name}' schema references {schema['$ref']}"
+                                    f"response {status_code} schema references "
+                                    f"{ref}"
                                 ),
                                 source_file=source_file,
-                                source_location=f"{source_base}.parameters[{i}].schema.$ref",
-                                raw_snippet=schema["$ref"],
+                                source_location=(
+                                    f"{source_base}.responses.{status_code}"
+                                    f".content.{mime}.schema.$ref"
+                                ),
+                                raw_snippet=ref,
                             )
-                        )
-
-            # --- Responses (OpenAPI 2 & 3) ---
-            responses = operation.get("responses", {})
-            if isinstance(responses, dict):
-                for status_code, response_obj in responses.items():
-                    if not isinstance(response_obj, dict):
-                        continue
-
-                    # Include description in observation to capture condition information
-                    description = response_obj.get("description", "")
-                    if description:
-                        observation = f"documents possible response {status_code}: {description}"
-                    else:
-                        observation = f"documents possible response {status_code}"
 
+                # OpenAPI 2: schema directly under response
+                ref = _schema_ref(response_obj.get("schema"), source_file, endpoint)
+                if ref is not _NO_REF:
                     emit(
-                        Evidence(
-                            type=EvidenceType.SPEC_RESPONSE,
-                            endpoint=endpoint,
-                            observation=observation,
-                            source_file=source_file,
-                            source_location=f"{source_base}.responses.{status_code}",
-                            raw_snippet=yaml.safe_dump(response_obj, sort_keys=False),
-                        )
+                        type=EvidenceType.SPEC_SCHEMA_REF,
+                        endpoint=endpoint,
+                        observation=(
+                            f"response {status_code} schema references "
+                            f"{ref}"
+                        ),
+                        source_file=source_file,
+                        source_location=(
+                            f"{source_base}.responses.{status_code}.schema.$ref"
+                        ),
+                        raw_snippet=ref,
                     )
 
-                    # OpenAPI 3: content → schema
-                    content_obj = response_obj.get("content", {})
-                    if isinstance(content_obj, dict):
-                        for mime, media in content_obj.items():
-                            if not isinstance(media, dict):
-                                continue
-                            schema = media.get("schema")
-                            if isinstance(schema, dict) and "$ref" in schema:
-                                emit(
-                                    Evidence(
-                                        type=EvidenceType.SPEC_SCHEMA_REF,
-                                        endpoint=endpoint,
-                                        observation=(
-                                            f"response {status_code} schema references "
-                                            f"{schema['$ref']}"
-                                        ),
-                                        source_file=source_file,
-                                        source_location=(
-                                            f"{source_base}.responses.{status_code}"
-                                            f".content.{mime}.schema.$ref"
-                                        ),
-                                        raw_snippet=schema["$ref"],
-                                    )
-                                )
-
-                    # OpenAPI 2: schema directly under response
-                    schema = response_obj.get("schema")
-                    if isinstance(schema, dict) and "$ref" in schema:
-                        emit(
-                            Evidence(
+        # --- Request Body (OpenAPI 3, non-HEAD only) ---
+        if method_lc != "head":
+            request_body = operation.get("requestBody")
+            if isinstance(request_body, dict):
+                emit(
+                    type=EvidenceType.SPEC_REQUEST_BODY,
+                    endpoint=endpoint,
+                    observation="defines request body",
+                    source_file=source_file,
+                    source_location=f"{source_base}.requestBody",
+                    raw_snippet_source=request_body,
+                )
+
+                content_obj = request_body.get("content", {})
+                if isinstance(content_obj, dict):
+                    for mime, media in content_obj.items():
+                        if not isinstance(media, dict):
+                            continue
+                        ref = _schema_ref(media.get("schema"), source_file, endpoint)
+                        if ref is not _NO_REF:
+                            emit(
                                 type=EvidenceType.SPEC_SCHEMA_REF,
                                 endpoint=endpoint,
                                 observation=(
-                                    f"response {status_code} schema references "
-                                    f"{schema['$ref']}"
+                                    f"request body schema references "
+                                    f"{ref}"
                                 ),
                                 source_file=source_file,
                                 source_location=(
-                                    f"{source_base}.responses.{status_code}.schema.$ref"
+                                    f"{source_base}.requestBody.content."
+                                    f"{mime}.schema.$ref"
                                 ),
-                                raw_snippet=schema["$ref"],
+                                raw_snippet=ref,
                             )
-                        )
 
-            # --- Request Body (OpenAPI 3, non-HEAD only) ---
-            if method_lc != "head":
-                request_body = operation.get("requestBody")
-                if isinstance(request_body, dict):
-                    emit(
-                        Evidence(
-                            type=EvidenceType.SPEC_REQUEST_BODY,
-                            endpoint=endpoint,
-                            observation="defines request body",
-                            source_file=source_file,
-                            source_location=f"{source_base}.requestBody",
-                            raw_snippet=yaml.safe_dump(request_body, sort_keys=False),
-                        )
-                    )
+        # --- Security ---
+        security = operation.get("security")
+        if isinstance(security, list):
+            emit(
+                type=EvidenceType.SPEC_SECURITY,
+                endpoint=endpoint,
+                observation="defines security requirements",
+                source_file=source_file,
+                source_location=f"{source_base}.security",
+                raw_snippet_source=security,
+            )
 
-                    content_obj = request_body.get("content", {})
-                    if isinstance(content_obj, dict):
-                        for mime, media in content_obj.items():
-                            if not isinstance(media, dict):
-                                continue
-                            schema = media.get("schema")
-                            if isinstance(schema, dict) and "$ref" in schema:
-                                emit(
-                                    Evidence(
-                                        type=EvidenceType.SPEC_SCHEMA_REF,
-                                        endpoint=endpoint,
-                                        observation=(
-                                            f"request body schema references "
-                                            f"{schema['$ref']}"
-                                        ),
-                                        source_file=source_file,
-                                        source_location=(
-                                            f"{source_base}.requestBody.content."
-                                            f"{mime}.schema.$ref"
-                                        ),
-                                        raw_snippet=schema["$ref"],
-                                    )
-                                )
-
-            # --- Security ---
-            security = operation.get("security")
-            if isinstance(security, list):
-                emit(
-                    Evidence(
-                        type=EvidenceType.SPEC_SECURITY,
-                        endpoint=endpoint,
-                        observation="defines security requirements",
-                        source_file=source_file,
-                        source_location=f"{source_base}.security",
-                        raw_snippet=yaml.safe_dump(security, sort_keys=False),
-                    )
-                )
+    # YAML snippets are only dumped for rows that survived deduplication.
+    # Every field is a string built here (f-strings, dumped snippets, $ref
+    # values checked by _schema_ref, which may also be a null $ref's None),
+    # so validation is skipped.
+    evidence_list: List[Evidence] = []
+    for fields in rows:
+        if "raw_snippet_source" in fields:
+            fields["raw_snippet"] = snippet(fields.pop("raw_snippet_source"))
+        evidence_list.append(Evidence.model_construct(**fields))
 
     return evidence_list
\ No newline at end of file
@@ -1,7 +1,9 @@
 from app.evidence.evidence_model import Evidence, EvidenceType
-from typing import List, Optional
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
 import os
 import re
+import sys
 
 
 class TestContext:
@@ -20,68 +22,225 @@ REQUEST_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
-ASSERT_PATTERNS = [
+# Tried in priority order: on a line with several assertions the first
+# pattern that matches anywhere wins, not the leftmost match. (A single
+# alternation would change which status code is reported.)
+ASSERT_PATTERNS = (
     re.compile(r'assert\s+.*status_code\s*==\s*(\d+)'),
     re.compile(r'response\.status_code\s*==\s*(\d+)'),
     re.compile(r'assertEqual\([^,]*status_code[^,]*,\s*(\d+)\)'),
     re.compile(r'assertEquals\([^,]*status_code[^,]*,\s*(\d+)\)'),
     re.compile(r'expect.*status.*toBe\((\d+)\)'),
-]
+)
 
 TEST_DEF_PATTERN = re.compile(r'def\s+(test_[a-zA-Z0-9_]+)\s*\(')
 
+# Anchors that each pattern above requires, scanned over the whole file to
+# find the only lines worth classifying. Each one has a literal prefix the
+# stdlib engine can skip ahead to, so they stay on `re` and stay separate
+# (an alternation would lose that). The kind says which patterns can match;
+# kinds are bit flags so a line's kinds combine into one int.
+TEST_DEF_SIGNAL = 1
+REQUEST_SIGNAL = 2
+ASSERTION_SIGNAL = 4
+
+SIGNAL_PATTERNS = (
+    (TEST_DEF_SIGNAL, re.compile(r'def\s+test_')),
+    (REQUEST_SIGNAL, re.compile(r'\(\s*["\']')),
+    (ASSERTION_SIGNAL, re.compile(r'status_code')),
+    (ASSERTION_SIGNAL, re.compile(r'toBe\(')),
+)
+
+# Literal prefixes REQUEST_PATTERN requires, checked before running it
+REQUEST_PREFIXES = ("requests.", "client.")
+
+# Line boundaries str.splitlines() honours besides "\n"
+OTHER_LINE_BREAKS = re.compile('[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
 MAX_ASSERT_DISTANCE = 5  # lines
 
 
+# Segment shapes normalize_path replaces with {id}
+HEX_DIGITS = frozenset("0123456789abcdefABCDEF")
+UUID_LENGTH = 36
+
+
+def _strip_base_url_refs(path: str) -> str:
+    """Remove every {...} group that mentions base_url."""
+    parts = []
+    pos = 0
+    while True:
+        open_at = path.find('{', pos)
+        if open_at == -1:
+            break
+        close_at = path.find('}', open_at)
+        if close_at == -1:
+            break
+        # Any '{' nested before close_at sees a subset of this text, so a
+        # miss here rules it out too
+        if 'base_url' in path[open_at + 1:close_at]:
+            parts.append(path[pos:open_at])
+        else:
+            parts.append(path[pos:close_at + 1])
+        pos = close_at + 1
+    parts.append(path[pos:])
+    return ''.join(parts)
+
+
+def _strip_scheme_host(path: str) -> str:
+    for scheme in ('http://', 'https://'):
+        if path.startswith(scheme):
+            # The host must be non-empty, as in '^https?://[^/]+'
+            host_end = path.find('/', len(scheme))
+            if host_end == -1:
+                host_end = len(path)
+            if host_end > len(scheme):
+                return path[host_end:]
+            break
+    return path
+
+
+def _is_uuid_prefix(segment: str) -> bool:
+    # 8-4-4-4-12 hex digits
+    if len(segment) < UUID_LENGTH or not (
+        segment[8] == segment[13] == segment[18] == segment[23] == '-'
+    ):
+        return False
+    hex_part = segment[:UUID_LENGTH].replace('-', '')
+    return len(hex_part) == 32 and HEX_DIGITS.issuperset(hex_part)
+
+
+def _parameterize_segment(segment: str) -> str:
+    """Replace a leading UUID or run of digits with {id}."""
+    if _is_uuid_prefix(segment):
+        return '{id}' + segment[UUID_LENGTH:]
+    if segment[:1].isdecimal():
+        end = 1
+        while end < len(segment) and segment[end].isdecimal():
+            end += 1
+        return '{id}' + segment[end:]
+    return segment
+
+
+@lru_cache(maxsize=4096)
 def normalize_path(path: str) -> str:
     """
     Normalize concrete paths to a conservative parameterized form.
     No semantic inference is performed.
+
+    Built from plain string operations: URL expressions are short, so
+    per-call regex overhead outweighed the matching itself.
     """
     # Strip f-string variable references like {self.base_url}, {base_url}, etc.
-    path = re.sub(r'\{[^}]*base_url[^}]*\}', '', path)
-    
+    if '{' in path:
+        path = _strip_base_url_refs(path)
+
     # Strip scheme + host
-    path = re.sub(r'^https?://[^/]+', '', path)
+    path = _strip_scheme_host(path)
 
     # Strip query string
     path = path.split('?', 1)[0]
 
-    # Replace UUIDs
-    path = re.sub(
-        r'/[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
-        r'[0-9a-fA-F]{4}-[0-9a-fA-F]{12}',
-        '/{id}',
-        path,
-    )
-
-    # Replace numeric segments
-    path = re.sub(r'/\d+', '/{id}', path)
+    # Replace UUID and numeric segments
+    head, *segments = path.split('/')
+    path = '/'.join([head] + [_parameterize_segment(s) for s in segments])
 
     # Ensure path starts with /
     if not path.startswith('/'):
         path = '/' + path
-        
+
     # Clean up any double slashes
-    path = re.sub(r'/+', '/', path)
+    while '//' in path:
+        path = path.replace('//', '/')
 
     return path
 
 
+def _may_be_request(line: str) -> bool:
+    """
+    Cheap substring prefilter for REQUEST_PATTERN. Many lines carry the
+    paren-quote anchor (print("..."), f("...")) without a request call.
+    Non-ASCII lines skip the check since (?i) folding is wider than lower().
+    """
+    if not line.isascii():
+        return True
+    lowered = line.lower()
+    return any(prefix in lowered for prefix in REQUEST_PREFIXES)
+
+
+def _signal_lines(text: str) -> Iterator[Tuple[int, str, int]]:
+    """
+    Yield (line_num, line, anchor kind flags) for every line of newline-separated
+    text containing an anchor, in file order. Lines without anchors cannot
+    match any pattern.
+    """
+    hits = sorted(
+        (match.start(), kind)
+        for kind, pattern in SIGNAL_PATTERNS
+        for match in pattern.finditer(text)
+    )
+
+    line_num = 1
+    scanned_to = 0
+    current_line = 0
+    line_start = 0
+    kinds = 0
+
+    for start, kind in hits:
+        line_num += text.count("\n", scanned_to, start)
+        scanned_to = start
+
+        if line_num != current_line:
+            if kinds:
+                yield current_line, _line_at(text, line_start), kinds
+            current_line = line_num
+            line_start = text.rfind("\n", 0, start) + 1
+            kinds = 0
+        kinds |= kind
+
+    if kinds:
+        yield current_line, _line_at(text, line_start), kinds
+
+
+def _assert_status_code(line: str) -> Optional[str]:
+    """Status code from the highest-priority ASSERT_PATTERNS match, if any."""
+    for pattern in ASSERT_PATTERNS:
+        match = pattern.search(line)
+        if match:
+            return match.group(1)
+    return None
+
+
+def _line_at(text: str, line_start: int) -> str:
+    line_end = text.find("\n", line_start)
+    if line_end == -1:
+        return text[line_start:]
+    return text[line_start:line_end]
+
+
 # ---------- Main Extraction ----------
 
 def extract_test_evidence(file_path: str, content: str) -> List[Evidence]:
-    evidence_list: List[Evidence] = []
+    rows: List[tuple] = []
     seen_evidence = set()
+    source_file = sys.intern(os.path.basename(file_path))
+
+    # Scan the raw content when "\n" is its only line break; otherwise
+    # rejoin it so line numbers still agree with str.splitlines(). CRLF
+    # files are rewritten in one pass rather than split into line copies.
+    text = content
+    if OTHER_LINE_BREAKS.search(content):
+        text = content.replace("\r\n", "\n")
+        if OTHER_LINE_BREAKS.search(text):
+            text = "\n".join(content.splitlines())
 
-    lines = content.splitlines()
     current_test: Optional[TestContext] = None
 
-    for line_num, raw_line in enumerate(lines, 1):
-        line = raw_line.strip()
+    for line_num, line, kinds in _signal_lines(text):
+        line = line.strip()
 
         # ---- Detect new test function ----
-        test_match = TEST_DEF_PATTERN.match(line)
+        test_match = kinds & TEST_DEF_SIGNAL and TEST_DEF_PATTERN.match(line)
         if test_match:
             test_name = test_match.group(1)
             current_test = TestContext(test_name, line_num)
@@ -91,17 +250,23 @@ def extract_test_evidence(file_path: str, content: str) -> List[Evidence]:
             continue
 
         # ---- Detect request call ----
-        request_match = REQUEST_PATTERN.search(line)
+        request_match = (
+            kinds & REQUEST_SIGNAL
+            and _may_be_request(line)
+            and REQUEST_PATTERN.search(line)
+        )
         if request_match:
             method, url_expr = request_match.groups()
             path = normalize_path(url_expr)
 
-            current_test.current_endpoint = f"{method.upper()} {path}"
+            # Interned: shared by every assertion row and matched against
+            # spec/README endpoints when claims are grouped
+            current_test.current_endpoint = sys.intern(f"{method.upper()} {path}")
             current_test.last_request_line = line_num
             continue
 
         # ---- Detect assertions ----
-        if current_test.current_endpoint is None:
+        if not kinds & ASSERTION_SIGNAL or current_test.current_endpoint is None:
             continue
 
         # Enforce proximity to request
@@ -111,40 +276,41 @@ def extract_test_evidence(file_path: str, content: str) -> List[Evidence]:
         ):
             continue
 
-        for pattern in ASSERT_PATTERNS:
-            match = pattern.search(line)
-            if not match:
-                continue
-
-            status_code = match.group(1)
-
-            evidence_key = (
-                current_test.current_endpoint,
-                status_code,
-                current_test.name,
-                line_num,
-            )
-            if evidence_key in seen_evidence:
-                break
-
-            seen_evidence.add(evidence_key)
-
-            evidence_list.append(
-                Evidence(
-                    type=EvidenceType.TEST_ASSERTION,
-                    endpoint=current_test.current_endpoint,
-                    observation=f"observed HTTP {status_code} in test {current_test.name}",
-                    source_file=os.path.basename(file_path),
-                    source_location=(
-                        f"{current_test.name} [line {line_num}]"
-                    ),
-                    raw_snippet=raw_line.strip(),
-                )
-            )
-
-            # Reset endpoint after first assertion to prevent leakage
-            current_test.current_endpoint = None
-            current_test.last_request_line = None
-            break
+        status_code = _assert_status_code(line)
+        if status_code is None:
+            continue
+
+        evidence_key = (
+            current_test.current_endpoint,
+            status_code,
+            current_test.name,
+            line_num,
+        )
+        if evidence_key in seen_evidence:
+            continue
 
-    return evidence_list
\ No newline at end of file
+        seen_evidence.add(evidence_key)
+
+        rows.append((
+            current_test.current_endpoint,
+            f"observed HTTP {status_code} in test {current_test.name}",
+            f"{current_test.name} [line {line_num}]",
+            line,
+        ))
+
+        # Reset endpoint after first assertion to prevent leakage
+        current_test.current_endpoint = None
+        current_test.last_request_line = None
+
+    # Fields are regex captures and f-strings, so validation is skipped
+    return [
+        Evidence.model_construct(
+            type=EvidenceType.TEST_ASSERTION,
+            endpoint=endpoint,
+            observation=observation,
+            source_file=source_file,
+            source_location=source_location,
+            raw_snippet=raw_snippet,
+        )
+        for endpoint, observation, source_location, raw_snippet in rows
+    ]
\ No newline at end of file
@@ -20,16 +20,20 @@ Does NOT:
 Think of this as main() for the semantic engine.
 """
 
-from typing import List, Union, Optional
+from typing import Iterator, List, Union, Optional, Tuple
 from pathlib import Path
 import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from multiprocessing import get_context
 from dataclasses import dataclass
 
 # Pipeline stage imports
 from app.ingest.extract import extract_evidence_from_file
 from app.claims.evidence_to_claim import DeterministicClaimGenerator
-from app.analysis.analysis import analyse_claims
-from app.analysis.evaluation import evaluate_bucket
+# Memoized wrappers: identical claim sets are analysed and evaluated once
+from app.analysis.cache import analyse_claims_cached as analyse_claims
+from app.analysis.cache import evaluate_bucket_cached as evaluate_bucket
 from app.display.display_processor import create_display_context
 
 # Debug logging
@@ -50,6 +54,14 @@ class ProcessResult:
     analysis_count: int
     evaluation_count: int
 
+# ---------- File type dispatch tables ----------
+# Built once at import; detect_file_type runs for every file in a codebase.
+
+README_NAMES = frozenset({'readme.md', 'readme.txt', 'readme.rst', 'readme'})
+README_SUFFIXES = ('.md', '.txt', '.rst')
+SPEC_SUFFIXES = frozenset({'.yaml', '.yml', '.json'})
+CODE_SUFFIXES = frozenset({'.py', '.java', '.cs', '.js', '.ts', '.go', '.rs', '.cpp', '.c'})
+
 def detect_file_type(file_path: Union[str, Path]) -> Optional[ArtifactSource]:
     """
     Detect artifact source type based on file name and extension patterns.
@@ -62,35 +74,95 @@ def detect_file_type(file_path: Union[str, Path]) -> Optional[ArtifactSource]:
     """
     file_path = Path(file_path)
     filename = file_path.name.lower()
+    suffix = file_path.suffix.lower()
     
     # README files (case insensitive) - check this first before test patterns
-    if ('readme' in filename and filename.endswith(('.md', '.txt', '.rst'))) or filename in ['readme.md', 'readme.txt', 'readme.rst', 'readme']:
+    if ('readme' in filename and filename.endswith(README_SUFFIXES)) or filename in README_NAMES:
         return ArtifactSource.README
     
-    # API specification files  
-    api_spec_patterns = ['openapi', 'swagger', 'api-spec', 'api_spec', 'spec']
-    if any(pattern in filename for pattern in api_spec_patterns):
+    # API specification files ('api-spec' / 'api_spec' are covered by 'spec')
+    if 'spec' in filename or 'openapi' in filename or 'swagger' in filename:
         # If it's a YAML/JSON file with 'spec' in name, likely an API spec
-        if file_path.suffix.lower() in ['.yaml', '.yml', '.json']:
+        if suffix in SPEC_SUFFIXES:
             return ArtifactSource.API_SPEC
-    elif file_path.suffix.lower() in ['.yaml', '.yml', '.json'] and 'api' in filename:
+    elif suffix in SPEC_SUFFIXES and 'api' in filename:
         return ArtifactSource.API_SPEC
     
-    # Test files
-    test_patterns = ['test', '_test', '.test', 'spec', '_spec', '.spec']
-    if any(pattern in filename for pattern in test_patterns):
+    # Test files ('_test', '.test', '_spec', '.spec' are covered by 'test' / 'spec')
+    if 'test' in filename or 'spec' in filename:
         return ArtifactSource.TEST
     elif 'test' in str(file_path.parent).lower():
         return ArtifactSource.TEST
     
     # Default to TEST for code files (most likely to contain behavioral assertions)
-    code_extensions = ['.py', '.java', '.cs', '.js', '.ts', '.go', '.rs', '.cpp', '.c']
-    if file_path.suffix.lower() in code_extensions:
+    if suffix in CODE_SUFFIXES:
         return ArtifactSource.TEST
     
     # Cannot determine type
     return None
 
+# Below this many files, worker start-up costs more than parallelism saves
+PARALLEL_EXTRACTION_MIN_FILES = 4
+
+def _extract_serially(jobs: List[Tuple[str, ArtifactSource]]) -> Iterator[Future]:
+    """Extract each job in this process, wrapping the outcome in a finished Future."""
+    for file_path, file_type in jobs:
+        future = Future()
+        try:
+            future.set_result(extract_evidence_from_file(file_path, file_type))
+        except Exception as e:
+            future.set_exception(e)
+        yield future
+
+@contextmanager
+def _extract_files(jobs: List[Tuple[str, ArtifactSource]]) -> Iterator[Iterator[Future]]:
+    """
+    Run evidence extraction for (file_path, file_type) jobs, giving one
+    Future per job in job order; result() raises that file's extraction
+    error with the worker traceback attached. Files are independent and
+    extraction is CPU-bound, so larger batches are spread across worker
+    processes.
+    """
+    if len(jobs) < PARALLEL_EXTRACTION_MIN_FILES:
+        yield _extract_serially(jobs)
+        return
+
+    # The pool lives for this call only, and its workers are spawned rather
+    # than forked: process_files also runs inside the threaded API server,
+    # whose Gemini client and held locks must not be copied into children.
+    pool = ProcessPoolExecutor(
+        max_workers=min(len(jobs), os.cpu_count() or 1),
+        mp_context=get_context("spawn"),
+    )
+    try:
+        yield iter([
+            pool.submit(extract_evidence_from_file, file_path, file_type)
+            for file_path, file_type in jobs
+        ])
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+def _iter_evidence(jobs: List[Tuple[str, ArtifactSource]]) -> Iterator[Evidence]:
+    """Stream evidence from each job in order, raising the first extraction failure."""
+    with _extract_files(jobs) as results:
+        for future in results:
+            yield from future.result()
+
+class _CountingIterator:
+    """Pass items through while counting them, so streamed stages still report sizes."""
+
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._iterator)
+        self.count += 1
+        return item
+
 def process_files(file_paths: List[Union[str, Path]], enable_logging: bool = True) -> ProcessResult:
     """
     Process multiple files through the complete semantic analysis pipeline.
@@ -107,42 +179,47 @@ def process_files(file_paths: List[Union[str, Path]], enable_logging: bool = Tru
     logger = ProcessLogger() if enable_logging else None
     
     try:
+        # Detect each file's type once; logging and extraction both reuse it
+        typed_paths = [(file_path, detect_file_type(file_path)) for file_path in file_paths]
+        jobs = [(str(file_path), file_type) for file_path, file_type in typed_paths if file_type is not None]
+        
         # Log input files
         if logger:
-            detected_types = {}
-            for fp in file_paths:
-                file_type = detect_file_type(fp)
-                detected_types[str(fp)] = file_type.value if file_type else "UNKNOWN"
+            detected_types = {
+                str(fp): file_type.value if file_type else "UNKNOWN"
+                for fp, file_type in typed_paths
+            }
             logger.log_file_inputs(file_paths, detected_types)
     
         # Stage 1: Evidence Extraction
+        # Without logging, evidence is streamed straight into claim generation
+        # (Stage 2) instead of being collected; the logger needs the full list.
         all_evidence: List[Evidence] = []
+        evidence_stream = None
         
         if logger:
             with logger.stage("Evidence Extraction", {"input_files": len(file_paths)}) as stage:
                 stage.set_input_count(len(file_paths))
                 
-                for file_path in file_paths:
-                    file_type = detect_file_type(file_path)
-                    if file_type is not None:
+                with _extract_files(jobs) as results:
+                    # Stage messages are emitted from the results, in input order
+                    for file_path, file_type in typed_paths:
+                        if file_type is None:
+                            stage.log_message(f"Skipping {Path(file_path).name} - unknown file type")
+                            continue
                         stage.log_message(f"Processing {Path(file_path).name} as {file_type.value}")
                         try:
-                            file_evidence = extract_evidence_from_file(str(file_path), file_type)
-                            all_evidence.extend(file_evidence)
-                            stage.log_message(f"Extracted {len(file_evidence)} evidence items")
+                            file_evidence = next(results).result()
                         except Exception as e:
                             stage.add_error(f"Failed to extract evidence from {file_path}: {str(e)}")
-                    else:
-                        stage.log_message(f"Skipping {Path(file_path).name} - unknown file type")
+                            continue
+                        all_evidence.extend(file_evidence)
+                        stage.log_message(f"Extracted {len(file_evidence)} evidence items")
                 
                 stage.set_output_count(len(all_evidence))
                 logger.log_evidence_details(all_evidence)
         else:
-            for file_path in file_paths:
-                file_type = detect_file_type(file_path)
-                if file_type is not None:
-                    file_evidence = extract_evidence_from_file(str(file_path), file_type)
-                    all_evidence.extend(file_evidence)
+            evidence_stream = _CountingIterator(_iter_evidence(jobs))
 
         # Stage 2: Evidence → Claims Transformation
         if logger:
@@ -156,8 +233,12 @@ def process_files(file_paths: List[Union[str, Path]], enable_logging: bool = Tru
                 stage.add_detail("rejections_count", len(rejections) if rejections else 0)
                 logger.log_claims_details(claims, rejections)
         else:
+            # Rejections are only reported by the logger, so they are dropped here
             generator = DeterministicClaimGenerator()
-            claims, rejections = generator.process(all_evidence)
+            claims = [
+                item for item in generator.process_iter(evidence_stream)
+                if isinstance(item, Claim)
+            ]
 
         # Stage 3: Claims Analysis (Pure Facts)
         if logger:
@@ -203,7 +284,7 @@ def process_files(file_paths: List[Union[str, Path]], enable_logging: bool = Tru
 
         result = ProcessResult(
             display_context=display_context,
-            evidence_count=len(all_evidence),
+            evidence_count=evidence_stream.count if evidence_stream is not None else len(all_evidence),
             claims_count=len(claims),
             analysis_count=len(analyses),
             evaluation_count=len(evaluations)
@@ -220,6 +301,38 @@ def process_files(file_paths: List[Union[str, Path]], enable_logging: bool = Tru
             logger.finalize_log(None)
         raise
 
+def _find_files(directory: str, file_extensions: List[str]) -> List[str]:
+    """
+    Collect files under directory whose names end with any of file_extensions
+    in a single os.scandir walk. Results are grouped by extension, in the
+    order the extensions were given, matching one rglob per extension: a
+    file is listed once for every entry it matches, repeated or overlapping
+    entries included.
+    """
+    matches = [(ext, []) for ext in file_extensions]
+    
+    def walk(path: str) -> None:
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            return
+        
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+                continue
+            for ext, found in matches:
+                if entry.name.endswith(ext):
+                    found.append(entry.path)
+        
+        for subdir in subdirs:
+            walk(subdir)
+    
+    walk(directory)
+    return [file_path for _, found in matches for file_path in found]
+
 def process_directory(directory_path: Union[str, Path], 
                      file_extensions: Optional[List[str]] = None,
                      enable_logging: bool = True) -> ProcessResult:
@@ -243,9 +356,7 @@ def process_directory(directory_path: Union[str, Path],
         raise ValueError(f"Directory does not exist: {directory_path}")
     
     # Find all relevant files
-    file_paths = []
-    for ext in file_extensions:
-        file_paths.extend(directory.rglob(f'*{ext}'))
+    file_paths = _find_files(str(directory), file_extensions)
     
     return process_files(file_paths, enable_logging)
 
@@ -0,0 +1,16 @@
+import sys
+import os
+
+# Put backend/app on sys.path once, however many test scripts import this
+APP_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if APP_DIR not in sys.path:
+    sys.path.insert(0, APP_DIR)
+
+def block_buffer_stdout():
+    """
+    Stop flushing stdout on every newline when it is a terminal; the test
+    scripts write hundreds of short lines. input() still flushes before
+    prompting, and everything is flushed at exit.
+    """
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
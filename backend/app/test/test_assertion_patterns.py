@@ -0,0 +1,30 @@
+# Add backend directory to path for imports (skipped if already present)
+import _bootstrap
+
+from app.ingest.test_extractor import extract_test_evidence
+
+print("Testing status assertion pattern priority")
+print("=" * 60)
+
+# With several assertions on one line the first pattern in priority order
+# wins (assert ... == 404), not the leftmost match (assertEqual ..., 201).
+source = """\
+def test_create_user():
+    r = client.post("/users", json={})
+    assertEqual(r.status_code, 201); assert r.status_code == 404
+
+def test_delete_user():
+    r = requests.delete("/users/1")
+    self.assertEqual(r.status_code, 204)
+"""
+
+evidence = extract_test_evidence("test_users.py", source)
+for e in evidence:
+    print(f"  {e.endpoint}: {e.observation}")
+
+assert [(e.endpoint, e.observation) for e in evidence] == [
+    ("POST /users", "observed HTTP 404 in test test_create_user"),
+    ("DELETE /users/{id}", "observed HTTP 204 in test test_delete_user"),
+]
+
+print(f"\n✅ {len(evidence)} assertions extracted as expected")
@@ -1,29 +1,119 @@
 import sys
 import os
-import json
-from pathlib import Path
+import re
+import stat
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 
 # Add the backend app to the path so we can import our modules
-# Since we're now in backend/app/test/, we need to go up one level to reach backend/app
-script_dir = os.path.dirname(__file__)
-backend_app_dir = os.path.dirname(script_dir)
-sys.path.insert(0, backend_app_dir)
+# Since we're now in backend/app/test/, _bootstrap goes up one level to reach backend/app
+import _bootstrap
 
-from ingest.extract import extract_evidence_from_file
+# The extractors (which pull in the Gemini client) and the claim generator
+# are imported on first use, so the interactive menu and usage text start fast
 from app.claims.claim_model import ArtifactSource
-from app.evidence.evidence_model import Evidence, EvidenceType
-from app.claims.evidence_to_claim import DeterministicClaimGenerator
 from app.analysis.analysis import analyse_claims
 from app.analysis.evaluation import evaluate_bucket, generate_policy_recommendations
 
+# Common top-level README / API spec file names and their types, in report
+# order. Keys are casefolded: scanned names are matched case-insensitively,
+# as the original existence probes did on case-insensitive filesystems
+# (README.md, Readme.md, API.yaml, ...)
+FILENAME_TO_TYPE = {
+    "readme.md": ArtifactSource.README,
+    "readme.txt": ArtifactSource.README,
+    "api.yaml": ArtifactSource.API_SPEC,
+    "api.yml": ArtifactSource.API_SPEC,
+    "openapi.yaml": ArtifactSource.API_SPEC,
+    "openapi.yml": ArtifactSource.API_SPEC,
+    "swagger.yaml": ArtifactSource.API_SPEC,
+    "swagger.yml": ArtifactSource.API_SPEC,
+    "api.json": ArtifactSource.API_SPEC,
+    "openapi.json": ArtifactSource.API_SPEC,
+    "swagger.json": ArtifactSource.API_SPEC,
+}
+
+# Dependency, cache and build output directories never hold the project's
+# own tests; hidden directories (.git, .venv, .tox, ...) are skipped as well
+SKIP_DIRS = frozenset({
+    "node_modules", "__pycache__", "venv", "build", "dist", "target",
+})
+
+# Set CONCORD_DEBUG=1 to print a traceback for each file that fails
+SHOW_TRACEBACKS = os.environ.get("CONCORD_DEBUG") == "1"
+
+# Report banners, built once rather than on every call
+ANALYSIS_BANNER = "#" * 80
+CLAIMS_BANNER = "*" * 80
+EVIDENCE_BANNER = "=" * 80
+SECTION_RULE = "-" * 60
+
+# Test files: 'test' or 'spec' anywhere in the name (ASCII case-insensitive,
+# as str.lower() behaves for these letters) and a known code extension
+TEST_FILE_RE = re.compile(r'(?ai:test|spec)(?s:.*)\.(?:py|js|java|ts|go|rb)\Z')
+
+@lru_cache(maxsize=None)
+def _claim_generator():
+    """One generator for the whole run; it holds only the fixed policy tables."""
+    from app.claims.evidence_to_claim import DeterministicClaimGenerator
+    return DeterministicClaimGenerator()
+
+@lru_cache(maxsize=512)
+def _generate_claims(evidence):
+    """
+    Claim generation memoized on the evidence tuple (Evidence is a frozen,
+    hashable model), so files with identical evidence are processed once.
+    """
+    claims, rejections = _claim_generator().process(list(evidence))
+    return tuple(claims), tuple(rejections)
+
+# Evidence keyed on (absolute path, mtime, size, type): re-testing an
+# unchanged file (interactive mode, overlapping directory runs) skips parsing.
+# Bounded so long interactive sessions over large trees do not grow it forever.
+MAX_CACHED_EVIDENCE = 512
+
+_evidence_cache = {}
+
+def _evidence_key(file_path, file_type, st):
+    return (os.path.abspath(file_path), st.st_mtime_ns, st.st_size, file_type)
+
+def _extract_evidence(file_path, file_type):
+    """Uncached extraction; module-level so worker processes can run it."""
+    from ingest.extract import extract_evidence_from_file
+    return tuple(extract_evidence_from_file(file_path, file_type))
+
+def _extract_evidence_cached(file_path, file_type, st=None, pending=None):
+    """
+    st: the caller's os.stat result for file_path, if it already has one.
+    pending: a Future already extracting this file in a worker, used on a miss.
+    """
+    if st is None:
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            return list(_extract_evidence(file_path, file_type))
+    
+    key = _evidence_key(file_path, file_type, st)
+    if key not in _evidence_cache:
+        if pending is not None:
+            evidence = pending.result()
+        else:
+            evidence = _extract_evidence(file_path, file_type)
+        if len(_evidence_cache) >= MAX_CACHED_EVIDENCE:
+            # Evict the oldest entry (dicts keep insertion order)
+            _evidence_cache.pop(next(iter(_evidence_cache)), None)
+        _evidence_cache[key] = evidence
+    return list(_evidence_cache[key])
+
 def print_analysis(analysis_results, file_path):
     """Print analysis results in a readable format using evaluation layer."""
-    print(f"\n{'#'*80}")
+    print("\n" + ANALYSIS_BANNER)
     print(f"ANALYSIS RESULTS FOR: {file_path}")
     print(f"ANALYSIS OBJECTS: {len(analysis_results)}")
     total_findings = sum(len(a.findings) for a in analysis_results)
     print(f"TOTAL FINDINGS: {total_findings}")
-    print(f"{'#'*80}")
+    print(ANALYSIS_BANNER)
     
     if not analysis_results:
         print("[X] No analysis results generated.")
@@ -40,9 +130,9 @@ def print_analysis(analysis_results, file_path):
         if not evaluations_at_level:
             continue
             
-        print(f"\n{'-'*60}")
+        print("\n" + SECTION_RULE)
         print(f"{risk_level.upper()} RISK LEVEL ({len(evaluations_at_level)} endpoints)")
-        print(f"{'-'*60}")
+        print(SECTION_RULE)
         
         for i, evaluation in enumerate(evaluations_at_level, 1):
             print(f"\n[A{i}] ANALYSIS #{i}")
@@ -70,82 +160,101 @@ def print_analysis(analysis_results, file_path):
 
 def print_claims(claims, rejections, file_path):
     """Print claims and rejections in a readable format."""
-    print(f"\n{'*'*80}")
+    print("\n" + CLAIMS_BANNER)
     print(f"CLAIM GENERATION RESULTS FOR: {file_path}")
     print(f"CLAIMS GENERATED: {len(claims)}")
     print(f"REJECTIONS: {len(rejections)}")
-    print(f"{'*'*80}")
+    print(CLAIMS_BANNER)
     
     if claims:
-        print(f"\n{'-'*60}")
+        print("\n" + SECTION_RULE)
         print("GENERATED CLAIMS:")
-        print(f"{'-'*60}")
+        print(SECTION_RULE)
         
+        # One write per claim rather than one per field
         for i, claim in enumerate(claims, 1):
-            print(f"\n[C{i}] CLAIM #{i}")
-            print(f"|- Category: {claim.category.value}")
-            print(f"|- Endpoint: {claim.endpoint}")
-            print(f"|- Assertion: {claim.assertion}")
-            print(f"|- Condition: {claim.condition or 'None'}")
-            print(f"|- Source: {claim.source.value}")
-            print(f"|- Confidence: {claim.confidence:.2f}")
+            sys.stdout.write(
+                f"\n[C{i}] CLAIM #{i}\n"
+                f"|- Category: {claim.category.value}\n"
+                f"|- Endpoint: {claim.endpoint}\n"
+                f"|- Assertion: {claim.assertion}\n"
+                f"|- Condition: {claim.condition or 'None'}\n"
+                f"|- Source: {claim.source.value}\n"
+                f"|- Confidence: {claim.confidence:.2f}\n"
+            )
     
     if rejections:
-        print(f"\n{'-'*60}")
+        print("\n" + SECTION_RULE)
         print("REJECTIONS:")
-        print(f"{'-'*60}")
+        print(SECTION_RULE)
         
         for i, rejection in enumerate(rejections, 1):
-            print(f"\n[R{i}] REJECTION #{i}")
-            print(f"|- Phase: {rejection.phase}")
-            print(f"|- Reason: {rejection.reason}")
-            print(f"|- Evidence ID: {rejection.evidence_id}")
-            print(f"|- Raw Data: {rejection.raw_data}")
+            sys.stdout.write(
+                f"\n[R{i}] REJECTION #{i}\n"
+                f"|- Phase: {rejection.phase}\n"
+                f"|- Reason: {rejection.reason}\n"
+                f"|- Evidence ID: {rejection.evidence_id}\n"
+                f"|- Raw Data: {rejection.raw_data}\n"
+            )
 
-def print_evidence(evidence_list, file_path, file_type):
-    """Print evidence in a readable format."""
-    print(f"\n{'='*80}")
-    print(f"EVIDENCE EXTRACTION RESULTS FOR: {file_path}")
-    print(f"FILE TYPE: {file_type.value}")
-    print(f"EVIDENCE COUNT: {len(evidence_list)}")
-    print(f"{'='*80}")
+def print_evidence(evidence_list, file_path, file_type, out=None):
+    """
+    Print evidence in a readable format. The report is built as one string
+    and written once, to out (default: the current sys.stdout).
+    """
+    parts = [
+        f"\n{EVIDENCE_BANNER}\n"
+        f"EVIDENCE EXTRACTION RESULTS FOR: {file_path}\n"
+        f"FILE TYPE: {file_type.value}\n"
+        f"EVIDENCE COUNT: {len(evidence_list)}\n"
+        f"{EVIDENCE_BANNER}\n"
+    ]
     
     if not evidence_list:
-        print("[X] No evidence extracted from this file.")
-        return
+        parts.append("[X] No evidence extracted from this file.\n")
     
     for i, evidence in enumerate(evidence_list, 1):
-        print(f"\n[E{i}] EVIDENCE #{i}")
-        print(f"|- Type: {evidence.type.value}")
-        print(f"|- Endpoint: {evidence.endpoint}")
-        print(f"|- Observation: {evidence.observation}")
-        print(f"|- Source File: {evidence.source_file}")
-        print(f"|- Source Location: {evidence.source_location}")
-        print(f"'- Raw Snippet:")
-        
-        # Format the raw snippet nicely
+        # Format the raw snippet nicely: every line, blank ones included, gets the gutter
         if evidence.raw_snippet:
-            snippet_lines = evidence.raw_snippet.split('\n')
-            for line in snippet_lines:
-                print(f"   | {line}")
+            snippet = "   | " + evidence.raw_snippet.replace("\n", "\n   | ")
         else:
-            print(f"   | (No snippet available)")
+            snippet = "   | (No snippet available)"
+        
+        parts.append(
+            f"\n[E{i}] EVIDENCE #{i}\n"
+            f"|- Type: {evidence.type.value}\n"
+            f"|- Endpoint: {evidence.endpoint}\n"
+            f"|- Observation: {evidence.observation}\n"
+            f"|- Source File: {evidence.source_file}\n"
+            f"|- Source Location: {evidence.source_location}\n"
+            f"'- Raw Snippet:\n"
+            f"{snippet}\n"
+        )
+    
+    (out or sys.stdout).write("".join(parts))
 
-def test_single_file(file_path, file_type):
-    """Test extraction, claim generation, and analysis on a single file."""
-    if not os.path.exists(file_path):
-        print(f"[X] File not found: {file_path}")
-        return False
+def test_single_file(file_path, file_type, st=None, pending=None):
+    """
+    Test extraction, claim generation, and analysis on a single file.
+    st: the caller's os.stat result for file_path, if it already has one.
+    pending: a Future extracting the file's evidence in a worker process.
+    """
+    # One stat serves both the existence check and the evidence cache key
+    if st is None:
+        try:
+            st = os.stat(file_path)
+        except (OSError, ValueError):
+            print(f"[X] File not found: {file_path}")
+            return False
     
     try:
         # Extract evidence
-        evidence_list = extract_evidence_from_file(file_path, file_type)
+        evidence_list = _extract_evidence_cached(file_path, file_type, st, pending)
         print_evidence(evidence_list, file_path, file_type)
         
         # Generate claims from evidence
         if evidence_list:
-            claim_generator = DeterministicClaimGenerator()
-            claims, rejections = claim_generator.process(evidence_list)
+            claims, rejections = map(list, _generate_claims(tuple(evidence_list)))
             print_claims(claims, rejections, file_path)
             
             # Analyze claims for insights
@@ -160,58 +269,153 @@ def test_single_file(file_path, file_type):
         return True
     except Exception as e:
         print(f"[X] Error processing {file_path}: {str(e)}")
-        import traceback
-        traceback.print_exc()
+        if SHOW_TRACEBACKS:
+            traceback.print_exc()
         return False
 
+def _scan_directory(directory_path):
+    """
+    Walk directory_path once with os.scandir, top-down like os.walk.
+    Returns ({casefolded name: [paths]} for top-level FILENAME_TO_TYPE
+    entries, [paths of test files]).
+    
+    Uses an explicit stack rather than recursion, so deeply nested trees
+    cannot hit the recursion limit. SKIP_DIRS and hidden directories are
+    not descended into.
+    """
+    top_level = {}
+    test_files = []
+    stack = [directory_path]
+    is_top = True
+    
+    while stack:
+        path = stack.pop()
+        try:
+            with os.scandir(path) as it:
+                entries = list(it)
+        except OSError:
+            is_top = False
+            continue
+        
+        subdirs = []
+        for entry in entries:
+            if is_top:
+                key = entry.name.casefold()
+                if key in FILENAME_TO_TYPE:
+                    top_level.setdefault(key, []).append(entry.path)
+            if entry.is_dir():
+                # Like os.walk, list symlinked directories but do not descend
+                name = entry.name
+                if not entry.is_symlink() and name not in SKIP_DIRS and not name.startswith("."):
+                    subdirs.append(entry.path)
+            elif TEST_FILE_RE.search(entry.name):
+                test_files.append(entry.path)
+        
+        # Reversed, so subdirectories pop in listing order (depth-first, like os.walk)
+        stack.extend(reversed(subdirs))
+        is_top = False
+    
+    return top_level, test_files
+
+# Below this many files, worker start-up costs more than parallelism saves
+PARALLEL_MIN_FILES = 4
+
 def test_directory(directory_path):
     """Test extraction and claim generation on common files in a directory."""
     if not os.path.exists(directory_path):
         print(f"❌ Directory not found: {directory_path}")
         return
     
-    # Common file patterns and their types
-    file_patterns = [
-        ("README.md", ArtifactSource.README),
-        ("readme.md", ArtifactSource.README),
-        ("README.txt", ArtifactSource.README),
-        ("api.yaml", ArtifactSource.API_SPEC),
-        ("api.yml", ArtifactSource.API_SPEC),
-        ("openapi.yaml", ArtifactSource.API_SPEC),
-        ("openapi.yml", ArtifactSource.API_SPEC),
-        ("swagger.yaml", ArtifactSource.API_SPEC),
-        ("swagger.yml", ArtifactSource.API_SPEC),
-        ("api.json", ArtifactSource.API_SPEC),
-        ("openapi.json", ArtifactSource.API_SPEC),
-        ("swagger.json", ArtifactSource.API_SPEC),
-    ]
-    
-    # Look for test files (common patterns)
-    test_extensions = ['.py', '.js', '.java', '.ts', '.go', '.rb']
-    
-    found_files = []
-    
-    # Check for README and API spec files
-    for filename, file_type in file_patterns:
-        full_path = os.path.join(directory_path, filename)
-        if os.path.exists(full_path):
-            found_files.append((full_path, file_type))
+    _test_directory_contents(directory_path)
+
+def _unique_files(found_files):
+    """
+    Drop later entries that are the same file as an earlier one (symlinked
+    test files, hard links), compared by device and inode. Returns
+    (file_path, file_type, st) with the stat result passed on to
+    test_single_file, so each file is stat'ed once; st is None for paths
+    that cannot be stat'ed, which are kept as-is.
+    """
+    seen = set()
+    unique = []
+    for file_path, file_type in found_files:
+        try:
+            st = os.stat(file_path)
+            key = (st.st_dev, st.st_ino)
+        except (OSError, ValueError):
+            st = None
+            key = file_path
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append((file_path, file_type, st))
+    return unique
+
+def _test_directory_contents(directory_path):
+    """test_directory for a path the caller has already checked."""
+    top_level, test_files = _scan_directory(directory_path)
     
-    # Look for test files recursively
-    for root, dirs, files in os.walk(directory_path):
-        for file in files:
-            if any(file.endswith(ext) for ext in test_extensions):
-                if 'test' in file.lower() or 'spec' in file.lower():
-                    full_path = os.path.join(root, file)
-                    found_files.append((full_path, ArtifactSource.TEST))
+    # README and API spec files first, then test files in walk order
+    # (several spellings can coexist on case-sensitive filesystems; sorted,
+    # so README.md still comes before readme.md)
+    found_files = [
+        (file_path, file_type)
+        for key, file_type in FILENAME_TO_TYPE.items()
+        for file_path in sorted(top_level.get(key, ()))
+    ]
+    found_files.extend((file_path, ArtifactSource.TEST) for file_path in test_files)
+    found_files = _unique_files(found_files)
     
     if not found_files:
         print(f"[X] No recognizable files found in {directory_path}")
         return
     
     print(f"[*] Found {len(found_files)} files to test in {directory_path}")
-    for file_path, file_type in found_files:
-        test_single_file(file_path, file_type)
+    
+    # The evidence and claim caches live in this process. Only files missing
+    # from the evidence cache are extracted, in worker processes when there
+    # are enough of them; claims, analysis and reports stay here, in
+    # discovery order.
+    misses = [
+        (file_path, file_type)
+        for file_path, file_type, st in found_files
+        if st is not None and _evidence_key(file_path, file_type, st) not in _evidence_cache
+    ]
+    if len(misses) < PARALLEL_MIN_FILES:
+        for file_path, file_type, st in found_files:
+            test_single_file(file_path, file_type, st)
+        return
+    
+    # Flush first so forked workers do not inherit (and re-emit) buffered output
+    sys.stdout.flush()
+    with ProcessPoolExecutor() as executor:
+        pending = {job: executor.submit(_extract_evidence, *job) for job in misses}
+        for file_path, file_type, st in found_files:
+            test_single_file(file_path, file_type, st, pending.get((file_path, file_type)))
+
+# Interactive mode menus and choices, built once
+INTERACTIVE_MENU = (
+    "\nOptions:\n"
+    "1. Test a single file (extract evidence + generate claims + analyze)\n"
+    "2. Test all files in a directory (extract evidence + generate claims + analyze)\n"
+    "3. Quit\n"
+)
+
+FILE_TYPE_MENU = (
+    "\nFile types:\n"
+    "1. README (markdown/text documentation)\n"
+    "2. API_SPEC (OpenAPI/Swagger YAML/JSON)\n"
+    "3. TEST (test files with assertions)\n"
+)
+
+# Command-line file type names (matched case-insensitively)
+ARTIFACT_BY_NAME = {source.value: source for source in ArtifactSource}
+
+FILE_TYPE_CHOICES = {
+    "1": ArtifactSource.README,
+    "2": ArtifactSource.API_SPEC,
+    "3": ArtifactSource.TEST
+}
 
 def interactive_mode():
     """Interactive mode for testing evidence extraction, claim generation, and analysis."""
@@ -219,31 +423,19 @@ def interactive_mode():
     print("=" * 70)
     
     while True:
-        print("\nOptions:")
-        print("1. Test a single file (extract evidence + generate claims + analyze)")
-        print("2. Test all files in a directory (extract evidence + generate claims + analyze)")
-        print("3. Quit")
+        sys.stdout.write(INTERACTIVE_MENU)
         
         choice = input("\nEnter your choice (1-3): ").strip()
         
         if choice == "1":
             file_path = input("Enter file path: ").strip().strip('"')
             
-            print("\nFile types:")
-            print("1. README (markdown/text documentation)")
-            print("2. API_SPEC (OpenAPI/Swagger YAML/JSON)")
-            print("3. TEST (test files with assertions)")
+            sys.stdout.write(FILE_TYPE_MENU)
             
             type_choice = input("Enter file type (1-3): ").strip()
             
-            type_map = {
-                "1": ArtifactSource.README,
-                "2": ArtifactSource.API_SPEC,
-                "3": ArtifactSource.TEST
-            }
-            
-            if type_choice in type_map:
-                test_single_file(file_path, type_map[type_choice])
+            if type_choice in FILE_TYPE_CHOICES:
+                test_single_file(file_path, FILE_TYPE_CHOICES[type_choice])
             else:
                 print("[X] Invalid file type choice")
         
@@ -260,6 +452,8 @@ def interactive_mode():
 
 def main():
     """Main function - handle command line arguments or start interactive mode for evidence extraction, claim generation, and analysis."""
+    _bootstrap.block_buffer_stdout()
+    
     if len(sys.argv) == 1:
         # No arguments - start interactive mode
         interactive_mode()
@@ -268,17 +462,22 @@ def main():
         file_path = sys.argv[1]
         file_type_str = sys.argv[2].upper()
         
-        try:
-            file_type = ArtifactSource(file_type_str.lower())
+        file_type = ARTIFACT_BY_NAME.get(file_type_str.lower())
+        if file_type is not None:
             test_single_file(file_path, file_type)
-        except ValueError:
+        else:
             print(f"[X] Invalid file type: {file_type_str}")
             print("Valid types: README, API_SPEC, TEST")
     elif len(sys.argv) == 2:
         # Directory path provided
         directory_path = sys.argv[1]
-        if os.path.isdir(directory_path):
-            test_directory(directory_path)
+        try:
+            is_dir = stat.S_ISDIR(os.stat(directory_path).st_mode)
+        except (OSError, ValueError):
+            is_dir = False
+        
+        if is_dir:
+            _test_directory_contents(directory_path)
         else:
             print(f"[X] Not a directory: {directory_path}")
     else:
@@ -5,17 +5,37 @@ This demonstrates how the three-tier information architecture plugs into the exi
 
 import sys
 import os
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import logging
+import _bootstrap
 
 from app.claims.claim_model import Claim, ArtifactSource, ClaimCategory
-from app.analysis.analysis import analyse_claims
-from app.analysis.evaluation import evaluate_bucket
+# Single pass over analysis + evaluation (memoized on the claim set)
+from app.analysis.fused import analyse_and_evaluate
 from app.display.display_processor import create_display_context
 from app.display.display_formatter import (
     format_canonical_unit_card, format_endpoint_summary,
     format_risk_driven_view, format_coverage_view, format_display_summary
 )
 
+# Simulated claims as (endpoint, category, condition, assertion, confidence, source) rows
+SAMPLE_CLAIM_ROWS = (
+    # Critical contradiction case
+    ("POST /api/orders", ClaimCategory.OUTPUT_GUARANTEE, "valid order data", "OUT_HTTP_200", 0.8, ArtifactSource.README),  # Success response
+    ("POST /api/orders", ClaimCategory.OUTPUT_GUARANTEE, "valid order data", "OUT_HTTP_201", 0.95, ArtifactSource.TEST),  # Different success response - CONFLICT!
+    ("POST /api/orders", ClaimCategory.OUTPUT_GUARANTEE, "valid order data", "OUT_HTTP_201", 0.9, ArtifactSource.API_SPEC),  # Agrees with test
+    
+    # Documentation-only case
+    ("GET /api/orders/{id}", ClaimCategory.ERROR_SEMANTICS, "order not found", "ERR_HTTP_404", 0.7, ArtifactSource.README),
+    
+    # Perfect agreement case
+    ("GET /api/health", ClaimCategory.OUTPUT_GUARANTEE, None, "OUT_HTTP_200", 0.98, ArtifactSource.TEST),
+    ("GET /api/health", ClaimCategory.OUTPUT_GUARANTEE, None, "OUT_HTTP_200", 0.85, ArtifactSource.API_SPEC),
+)
+
+# Pipeline progress goes to the log (set CONCORD_LOG=INFO to see it); the
+# formatted display output below stays on stdout
+logger = logging.getLogger(__name__)
+
 def simulate_pipeline_with_display():
     """Simulate complete pipeline with three-tier display output."""
     
@@ -23,93 +43,45 @@ def simulate_pipeline_with_display():
     print("=" * 70)
     
     # Simulate extracted claims from evidence (normally from extract.py + evidence_to_claim.py)
-    print("Step 1: Simulating Evidence Extraction & Claim Generation")
-    print("(In real pipeline: extract.py → evidence_to_claim.py)")
+    logger.info("Step 1: Simulating Evidence Extraction & Claim Generation")
+    logger.info("(In real pipeline: extract.py → evidence_to_claim.py)")
     
     claims = [
-        # Critical contradiction case
-        Claim(
-            endpoint="POST /api/orders",
-            category=ClaimCategory.OUTPUT_GUARANTEE, 
-            condition="valid order data",
-            assertion="OUT_HTTP_200",  # Success response
-            confidence=0.8,
-            source=ArtifactSource.README
-        ),
-        Claim(
-            endpoint="POST /api/orders",
-            category=ClaimCategory.OUTPUT_GUARANTEE,
-            condition="valid order data", 
-            assertion="OUT_HTTP_201",  # Different success response - CONFLICT!
-            confidence=0.95,
-            source=ArtifactSource.TEST
-        ),
-        Claim(
-            endpoint="POST /api/orders",
-            category=ClaimCategory.OUTPUT_GUARANTEE,
-            condition="valid order data",
-            assertion="OUT_HTTP_201",  # Agrees with test
-            confidence=0.9,
-            source=ArtifactSource.API_SPEC
-        ),
-        
-        # Documentation-only case
-        Claim(
-            endpoint="GET /api/orders/{id}",
-            category=ClaimCategory.ERROR_SEMANTICS,
-            condition="order not found",
-            assertion="ERR_HTTP_404", 
-            confidence=0.7,
-            source=ArtifactSource.README
-        ),
-        
-        # Perfect agreement case
-        Claim(
-            endpoint="GET /api/health",
-            category=ClaimCategory.OUTPUT_GUARANTEE,
-            condition=None,
-            assertion="OUT_HTTP_200",
-            confidence=0.98,
-            source=ArtifactSource.TEST
-        ),
-        Claim(
-            endpoint="GET /api/health",  
-            category=ClaimCategory.OUTPUT_GUARANTEE,
-            condition=None,
-            assertion="OUT_HTTP_200",
-            confidence=0.85,
-            source=ArtifactSource.API_SPEC
-        )
+        Claim(endpoint=endpoint, category=category, condition=condition,
+              assertion=assertion, confidence=confidence, source=source)
+        for endpoint, category, condition, assertion, confidence, source in SAMPLE_CLAIM_ROWS
     ]
     
-    print(f"✓ Generated {len(claims)} claims from evidence")
+    logger.info("✓ Generated %d claims from evidence", len(claims))
     
     # Step 2: Analysis (pure facts)
-    print("\nStep 2: Analysis Layer - Structural Facts Only")
-    print("(analysis.py - epistemic discipline maintained)")
+    logger.info("\nStep 2: Analysis Layer - Structural Facts Only")
+    logger.info("(analysis.py - epistemic discipline maintained)")
     
-    analyses = analyse_claims(claims)
-    print(f"✓ Analyzed {len(analyses)} behavioral units")
+    results = list(analyse_and_evaluate(claims))
+    analyses = [analysis for analysis, _ in results]
+    evaluations = [evaluation for _, evaluation in results]
+    logger.info("✓ Analyzed %d behavioral units", len(analyses))
     for analysis in analyses:
-        finding_count = len(analysis.findings)
-        print(f"  - {analysis.endpoint}: {finding_count} structural findings")
+        logger.info("  - %s: %d structural findings", analysis.endpoint, len(analysis.findings))
     
     # Step 3: Evaluation (heuristics & scoring)
-    print("\nStep 3: Evaluation Layer - Heuristic Scoring") 
-    print("(evaluation.py - risk assessment & confidence scoring)")
+    logger.info("\nStep 3: Evaluation Layer - Heuristic Scoring")
+    logger.info("(evaluation.py - risk assessment & confidence scoring)")
     
-    evaluations = []
-    for analysis in analyses:
-        evaluation = evaluate_bucket(analysis.claims, analysis.findings)
-        evaluations.append(evaluation)
-        print(f"  - {evaluation.endpoint}: {evaluation.risk_level} risk, {evaluation.coverage_score:.1f} coverage")
+    for evaluation in evaluations:
+        logger.info("  - %s: %s risk, %.1f coverage", evaluation.endpoint, evaluation.risk_level, evaluation.coverage_score)
     
     # Step 4: Display transformation 
-    print("\nStep 4: Display Context Creation")
-    print("(display_processor.py - three-tier information architecture)")
+    logger.info("\nStep 4: Display Context Creation")
+    logger.info("(display_processor.py - three-tier information architecture)")
     
     display_context = create_display_context(analyses, evaluations)
-    print(f"✓ Created display context with {display_context.total_behaviors()} behavioral units")
+    logger.info("✓ Created display context with %d behavioral units", display_context.total_behaviors())
+    
+    # CONCORD_QUIET=1 (CI sanity runs) checks the pipeline without formatting views
+    if os.environ.get("CONCORD_QUIET") == "1":
+        return display_context
     
     # Step 5: Show formatted output for different UI components
     print("\n" + "=" * 70)
@@ -152,6 +124,13 @@ def simulate_pipeline_with_display():
     return display_context
 
 if __name__ == "__main__":
+    # Log to stdout so step lines stay in order with the block-buffered report.
+    logging.basicConfig(stream=sys.stdout, format="%(message)s")
+    level = os.environ.get("CONCORD_LOG", "WARNING").upper()
+    if not isinstance(logging.getLevelName(level), int):
+        level = "WARNING"
+    logger.setLevel(level)
+    _bootstrap.block_buffer_stdout()
     display_context = simulate_pipeline_with_display()
     
     print("\n🎨 UI INTEGRATION NOTES:")
@@ -0,0 +1,31 @@
+import sys
+import types
+
+# Add backend directory to path for imports (skipped if already present)
+import _bootstrap
+
+# Runs offline: the context lookup below never calls Gemini, so a stub stands
+# in for the client (which needs GEMINI_API_KEY at import)
+_gemini_stub = types.ModuleType("app.gemini")
+_gemini_stub.generate_structured = lambda *args, **kwargs: []
+sys.modules.setdefault("app.gemini", _gemini_stub)
+
+from app.ingest.readme_extractor import _extract_endpoint_from_context
+
+print("Testing README endpoint lookup from context")
+print("=" * 60)
+
+# A backticked endpoint anywhere on a line wins over a bare one before it
+cases = [
+    (["GET /a and `PUT /b`"], 0, "PUT /b"),
+    (["Call GET /a first"], 0, "GET /a"),
+    (["Create a user:", "", "`POST /users`"], 0, "POST /users"),
+    (["no endpoint here"], 0, None),
+]
+
+for lines, current_line, expected in cases:
+    found = _extract_endpoint_from_context(lines, current_line)
+    print(f"  {lines!r} -> {found!r}")
+    assert found == expected, f"expected {expected!r}, got {found!r}"
+
+print(f"\n✅ {len(cases)} context lookups as expected")
@@ -0,0 +1,51 @@
+# Add backend directory to path for imports (skipped if already present)
+import _bootstrap
+
+from app.ingest.spec_extractor import extract_spec_evidence
+from app.evidence.evidence_model import EvidenceType
+
+print("Testing spec extractor $ref handling")
+print("=" * 60)
+
+# A null $ref is reported as before; list and number $refs are skipped
+# instead of ending up in raw_snippet.
+spec = """\
+paths:
+  /a:
+    get:
+      $ref: [x, y]
+  /b:
+    post:
+      parameters:
+        - name: id
+          in: query
+          schema:
+            $ref: null
+      requestBody:
+        content:
+          application/json:
+            schema:
+              $ref: 42
+      responses:
+        "200":
+          content:
+            application/json:
+              schema:
+                $ref: "#/components/schemas/B"
+"""
+
+evidence = extract_spec_evidence("api.yaml", spec)
+for e in evidence:
+    print(f"  {e.type.value}: {e.endpoint} - {e.observation}")
+
+assert all(e.raw_snippet is None or isinstance(e.raw_snippet, str) for e in evidence)
+assert len(set(evidence)) == len(evidence)
+assert not any(e.endpoint == "GET /a" for e in evidence)
+
+refs = [e for e in evidence if e.type == EvidenceType.SPEC_SCHEMA_REF]
+assert [(e.observation, e.raw_snippet) for e in refs] == [
+    ("parameter 'id' schema references None", None),
+    ("response 200 schema references #/components/schemas/B", "#/components/schemas/B"),
+]
+
+print(f"\n✅ {len(evidence)} evidence items, {len(refs)} schema refs as expected")